@@ -1,91 +1,338 @@
 #!/usr/bin/env python3
 """
 Build script to create standalone executables for Windows, macOS, and Linux
+
+Rebuilds are incremental: PyInstaller's work directory is kept between runs
+so unchanged sources skip re-analysis. Use `python build-player.py --clean`
+to force a full rebuild from scratch.
 """
 import os
 import sys
-import platform
+import argparse
+import shutil
+import hashlib
+import functools
+import pkgutil
+import sysconfig
 import subprocess
+import importlib.util
+import importlib.metadata
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+# Output locations - each target's work dir is kept between runs so
+# PyInstaller can reuse its analysis (out00-Analysis.toc etc.)
+BUILD_DIR = Path("build")
+DIST_DIR = Path("dist")
+
+# Per-user PyInstaller cache (UPX-compressed/stripped binaries), kept
+# across builds so unchanged libraries aren't recompressed every time
+CACHE_DIR = Path.home() / ".cache" / "signage-upx"
+
+# DLLs known to break when UPX-compressed
+UPX_EXCLUDE = ["vcruntime140.dll", "qwindows.dll"]
+
+# Per-platform (--add-data separator, icon file, extra PyInstaller options)
+PLATFORM_OPTIONS = {
+    "Windows": (";", "icon.ico", []),
+    "Darwin": (":", "icon.icns", ["--osx-bundle-identifier", "com.signage.player"]),
+    "Linux": (":", "icon.png", []),
+}
+
+# Bundles to build as (entry script, executable name). Independent targets
+# are built in parallel, one PyInstaller process each.
+TARGETS = [
+    ("player.py", "SignagePlayer"),
+]
+
+@functools.lru_cache(maxsize=1)
+def _system():
+    """Host OS name, fixed for the life of the process (imports platform lazily)"""
+    import platform
+    return platform.system()
+
 def check_pyinstaller():
-    """Check if PyInstaller is installed"""
+    """Check if PyInstaller is installed (without importing it)"""
+    return importlib.util.find_spec("PyInstaller") is not None
+
+def parse_args(argv=None):
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="Build the Signage Player executable")
+    parser.add_argument("--clean", "--fresh", action="store_true",
+                        help="Discard PyInstaller's cache and rebuild from scratch")
+    parser.add_argument("--debug", action="store_true",
+                        help="Keep docstrings and asserts in the bundled bytecode")
+    return parser.parse_args(argv)
+
+def _data_files():
+    """List the files bundled from data/ (empty if the folder is missing)"""
+    return sorted(p for p in Path("data").rglob("*") if p.is_file())
+
+def _data_entries(sep):
+    """--add-data arguments for each bundled data file"""
+    for path in _data_files():
+        yield "--add-data"
+        yield f"{path}{sep}{path.parent}"
+
+def _hidden_imports(script):
+    """--hidden-import arguments for every module in packages beside the script
+
+    Modules loaded dynamically (plugins, renderers) are invisible to
+    PyInstaller's static analysis, so list them explicitly.
+    """
+    source_dir = str(Path(script).parent)
+    args = []
+    for pkg in pkgutil.iter_modules([source_dir]):
+        if not pkg.ispkg:
+            continue
+        args += ["--hidden-import", pkg.name]
+        pkg_path = [str(Path(source_dir) / pkg.name)]
+        for module in pkgutil.walk_packages(pkg_path, prefix=pkg.name + "."):
+            args += ["--hidden-import", module.name]
+    return args
+
+def _tool(console_script, module):
+    """Command prefix for a PyInstaller tool
+
+    Runs the installed console script directly (skips runpy bootstrap);
+    only looks next to this interpreter so we never pick up another env's copy.
+    """
+    exe = shutil.which(console_script, path=sysconfig.get_path("scripts"))
+    return [exe] if exe else [sys.executable, "-m", module]
+
+def _spec_options(script, name, system, debug=False):
+    """Options baked into the target's .spec file"""
+    # Base PyInstaller options
+    options = [
+        "--onedir",            # App folder - no unpacking on every launch
+        "--windowed",          # No console window
+        "--name", name,
+    ]
+    
+    # Platform-specific options
+    sep, icon, extra = PLATFORM_OPTIONS.get(system, PLATFORM_OPTIONS["Linux"])
+    options.extend(_data_entries(sep))  # Include data folder
+    options.extend(extra)
+    
+    # Add icon if exists
+    if Path(icon).exists():
+        options.extend(["--icon", icon])
+    
+    # Bundle -OO bytecode (no docstrings/asserts) unless debugging. It goes
+    # in the spec, which always sets a level (PYTHONOPTIMIZE has no effect)
+    options.extend(["--optimize", "0" if debug else "2"])
+    
+    # Drop symbol tables from bundled binaries (kept for debug builds so
+    # crash backtraces stay symbolicated)
+    if system != "Windows" and not debug and shutil.which("strip"):
+        options.append("--strip")
+    
+    if shutil.which("upx"):
+        for dll in UPX_EXCLUDE:
+            options.extend(["--upx-exclude", dll])
+    
+    # Add the main script
+    options.extend(_hidden_imports(script))
+    options.append(script)
+    return options
+
+def _build_options(name, clean=False):
+    """Options for running PyInstaller against the target's .spec file"""
+    options = [
+        "--noconfirm",         # Overwrite dist/ without prompting
+        "--workpath", str(BUILD_DIR / name),
+        "--distpath", str(DIST_DIR),
+    ]
+    
+    # Only wipe the cache when asked; otherwise reuse the previous analysis
+    if clean:
+        options.append("--clean")
+    
+    # Compress binaries with UPX when it's installed
+    upx = shutil.which("upx")
+    if upx:
+        options.extend(["--upx-dir", str(Path(upx).parent)])
+    
+    options.append(f"{name}.spec")
+    return options
+
+def _write_spec(name, options):
+    """Generate <name>.spec with pyi-makespec, unless it's already current
+
+    The spec's first line records a digest of the options it was made
+    from, so it is only regenerated when those options change.
+    """
+    spec = Path(f"{name}.spec")
+    header = f"# build-options: {hashlib.sha256(' '.join(options).encode()).hexdigest()}\n"
+    if spec.exists():
+        with open(spec) as f:
+            if f.readline() == header:
+                return spec
+    
+    subprocess.check_call(_tool("pyi-makespec", "PyInstaller.utils.cliutils.makespec") + options)
+    spec.write_text(header + spec.read_text())
+    return spec
+
+def _compute_build_hash(options):
+    """Fingerprint every input of a build: options, source files and data/"""
+    import platform
+    
+    h = hashlib.sha256()
+    try:
+        pyinstaller_version = importlib.metadata.version("pyinstaller")
+    except importlib.metadata.PackageNotFoundError:
+        pyinstaller_version = "unknown"
+    options = [arg for arg in options if arg != "--clean"]
+    for part in (sys.version, platform.platform(), pyinstaller_version, *options):
+        h.update(part.encode())
+        h.update(b"\0")
+    
+    # Script, icon and spec appear in the options; data files are listed
+    # individually, so adding or removing one also changes the options
+    inputs = [Path(arg) for arg in options if Path(arg).is_file()]
+    inputs += _data_files()
+    for path in inputs:
+        h.update(str(path).encode())
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                h.update(chunk)
+    return h.hexdigest()
+
+def _run_one(job):
+    """Run PyInstaller for a single target, returning its exit code"""
+    name, spec_options, build_options, args = job
+    
+    # Skip PyInstaller entirely if nothing changed since the last good build
+    try:
+        _write_spec(name, spec_options)
+    except subprocess.CalledProcessError as e:
+        print(f"Generating {name}.spec failed")
+        return e.returncode
+    hash_file = DIST_DIR / f".{name}.build-hash"
+    build_hash = _compute_build_hash(spec_options + build_options)
+    # The app itself must still be there (the zip next to it doesn't count)
+    app = DIST_DIR / (f"{name}.app" if _system() == "Darwin" else name)
+    if not args.clean and app.exists() and hash_file.exists():
+        if hash_file.read_text().strip() == build_hash:
+            print(f"{name} is up to date")
+            return 0
+    
+    # Give every target its own PyInstaller config/cache dir so parallel
+    # builds don't corrupt each other's cached binaries
+    env = os.environ.copy()
+    env["PYINSTALLER_CONFIG_DIR"] = str(CACHE_DIR / name)
+    
+    # The work dir is never deleted between runs
+    work_dir = BUILD_DIR / name
+    work_dir.mkdir(parents=True, exist_ok=True)
+    
+    # Stream output line by line so failures surface immediately, and keep
+    # a copy in the work dir for CI artifacts
+    cmd = _tool("pyinstaller", "PyInstaller") + build_options
+    proc = subprocess.Popen(cmd, env=env, stdout=subprocess.PIPE,
+                            stderr=subprocess.STDOUT, text=True, bufsize=1)
+    with open(work_dir / "build.log", "w") as log:
+        for line in proc.stdout:
+            sys.stdout.write(line)
+            log.write(line)
+    returncode = proc.wait()
+    
+    if returncode == 0:
+        # Zip the app folder so there is still a single file to distribute
+        # (macOS builds are left as-is; the .app needs ditto/codesign tooling)
+        if _system() != "Darwin" and (DIST_DIR / name).is_dir():
+            shutil.make_archive(str(DIST_DIR / name), "zip", DIST_DIR, name)
+        hash_file.write_text(build_hash)
+    return returncode
+
+def _sign(app_path):
+    """Codesign a macOS app bundle, then notarize it if NOTARY_PROFILE is set
+    
+    Returns whether every step succeeded.
+    """
+    identity = os.environ["SIGN_IDENTITY"]
+    profile = os.environ.get("NOTARY_PROFILE")
     try:
-        import PyInstaller
+        # Notarization requires the hardened runtime
+        runtime = ["--options", "runtime"] if profile else []
+        subprocess.run(["codesign", "--deep", "--force", *runtime, "--sign", identity, str(app_path)], check=True)
+        if profile:
+            # Upload copy only - kept out of dist/ so it can't be mistaken
+            # for (or overwrite) a distributable archive
+            archive = BUILD_DIR / f"{app_path.stem}-notarize.zip"
+            archive.parent.mkdir(parents=True, exist_ok=True)
+            subprocess.run(["ditto", "-c", "-k", "--keepParent", str(app_path), str(archive)], check=True)
+            subprocess.run(["xcrun", "notarytool", "submit", str(archive),
+                            "--keychain-profile", profile, "--wait"], check=True)
+            subprocess.run(["xcrun", "stapler", "staple", str(app_path)], check=True)
+        print(f"Signed: {app_path}")
         return True
-    except ImportError:
+    except (subprocess.CalledProcessError, OSError) as e:
+        print(f"Signing {app_path} failed: {e}")
         return False
 
-def build():
-    """Build the executable for the current platform"""
+def build(argv=None, targets=TARGETS):
+    """Build the executables for the current platform"""
+    args = parse_args(argv)
     
     if not check_pyinstaller():
         print("PyInstaller not found. Installing...")
-        subprocess.check_call([sys.executable, "-m", "pip", "install", "pyinstaller"])
+        # uv resolves and installs much faster than pip when it's available
+        uv = shutil.which("uv")
+        if uv:
+            subprocess.check_call([uv, "pip", "install", "--python", sys.executable, "pyinstaller"])
+        else:
+            subprocess.check_call([sys.executable, "-m", "pip", "install", "pyinstaller"])
     
     # Determine platform-specific options
-    system = platform.system()
+    system = _system()
     
-    # Base PyInstaller command
-    cmd = [
-        sys.executable, "-m", "PyInstaller",
-        "--onefile",           # Single executable
-        "--windowed",          # No console window
-        "--name", "SignagePlayer",
-        "--clean",
+    jobs = [
+        (name, _spec_options(script, name, system, args.debug), _build_options(name, args.clean), args)
+        for script, name in targets
     ]
     
-    # Platform-specific options
-    if system == "Windows":
-        # Windows-specific
-        cmd.extend([
-            "--add-data", "data;data",  # Include data folder
-        ])
-        # Add icon if exists
-        if Path("icon.ico").exists():
-            cmd.extend(["--icon", "icon.ico"])
-            
-    elif system == "Darwin":
-        # macOS-specific
-        cmd.extend([
-            "--add-data", "data:data",
-            "--osx-bundle-identifier", "com.signage.player",
-        ])
-        if Path("icon.icns").exists():
-            cmd.extend(["--icon", "icon.icns"])
-            
-    else:
-        # Linux
-        cmd.extend([
-            "--add-data", "data:data",
-        ])
-        if Path("icon.png").exists():
-            cmd.extend(["--icon", "icon.png"])
-    
-    # Add the main script
-    cmd.append("player.py")
-    
     print(f"Building for {system}...")
-    print(f"Command: {' '.join(cmd)}")
+    for _, spec_options, build_options, _ in jobs:
+        print(f"Spec: {' '.join(spec_options)}")
+        print(f"Command: {' '.join(_tool('pyinstaller', 'PyInstaller') + build_options)}")
     print()
     
-    # Run PyInstaller
-    result = subprocess.run(cmd)
+    # Run PyInstaller - in parallel when there is more than one target
+    if len(jobs) > 1:
+        processes = min(len(jobs), os.cpu_count() or 1)
+        with multiprocessing.Pool(processes=processes) as pool:
+            results = pool.map(_run_one, jobs)
+    else:
+        results = [_run_one(job) for job in jobs]
     
-    if result.returncode == 0:
+    failed = [job[0] for job, rc in zip(jobs, results) if rc != 0]
+    
+    if not failed:
         print()
         print("=" * 50)
         print("Build successful!")
         print("=" * 50)
         
-        if system == "Windows":
-            print("Executable: dist/SignagePlayer.exe")
-        elif system == "Darwin":
-            print("Application: dist/SignagePlayer.app")
-        else:
-            print("Executable: dist/SignagePlayer")
+        for _, name in targets:
+            if system == "Windows":
+                print(f"Executable: dist/{name}/{name}.exe")
+            elif system == "Darwin":
+                print(f"Application: dist/{name}.app")
+            else:
+                print(f"Executable: dist/{name}/{name}")
+        
+        # Sign each app on its own thread: notarization is network-bound and
+        # can take minutes per target. A failed signing fails the build.
+        if system == "Darwin" and os.environ.get("SIGN_IDENTITY"):
+            with ThreadPoolExecutor(max_workers=len(targets)) as signer:
+                signed = list(signer.map(_sign, [DIST_DIR / f"{name}.app" for _, name in targets]))
+            if not all(signed):
+                print("Signing failed")
+                sys.exit(1)
     else:
-        print("Build failed!")
+        print(f"Build failed: {', '.join(failed)}")
         sys.exit(1)
 
 if __name__ == "__main__":
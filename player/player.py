@@ -5,18 +5,36 @@ Cross-platform player with local content caching and synchronized playback
 """
 import os
 import sys
+import gzip
 import json
 import time
 import hashlib
+import functools
+import socket
 import threading
-import urllib.request
-import urllib.error
+import http.client
 import urllib.parse
-import mimetypes
+from concurrent.futures import ThreadPoolExecutor, as_completed, CancelledError, TimeoutError as FutureTimeoutError
 from pathlib import Path
-from datetime import datetime
-from http.server import HTTPServer, SimpleHTTPRequestHandler
-import webview
+from datetime import datetime, timedelta
+from http.server import ThreadingHTTPServer, SimpleHTTPRequestHandler
+
+# orjson decodes server payloads several times faster than the stdlib;
+# it's optional, so fall back to json when it isn't installed. _dumps
+# returns pretty-printed UTF-8 bytes either way.
+try:
+    import orjson
+    _loads = orjson.loads
+    _dumps = lambda obj: orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+except ImportError:
+    _loads = json.loads
+    _dumps = lambda obj: json.dumps(obj, indent=2).encode()
+
+
+def _digest(data):
+    """Fingerprint for change detection (BLAKE2b is fast on ARM boards)"""
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
 
 # Configuration - store data in ./data folder next to player.py
 PLAYER_DIR = Path(__file__).parent
@@ -27,6 +45,9 @@ CONTENT_DIR = CACHE_DIR / "content"
 SPLASH_DIR = CACHE_DIR / "splash"
 DEFAULT_SERVER = "http://localhost:8000"
 LOCAL_SERVER_PORT = 8089  # Local cache server port
+REQUEST_DEADLINE = 12  # Seconds the page waits on a server call before giving up
+DOWNLOAD_CHUNK_SIZE = 128 * 1024  # Read size when streaming downloads of unknown length
+SYNC_WORKERS = 4  # Concurrent content downloads (matches HTTPPool's idle connections)
 
 # Ensure directories exist
 DATA_DIR.mkdir(parents=True, exist_ok=True)
@@ -38,6 +59,11 @@ SPLASH_DIR.mkdir(parents=True, exist_ok=True)
 class CacheHTTPHandler(SimpleHTTPRequestHandler):
     """HTTP handler that serves files from the cache directory"""
     
+    # Keep-alive, so the page's requests for media reuse their connections;
+    # idle ones are dropped after `timeout` seconds
+    protocol_version = "HTTP/1.1"
+    timeout = 60
+    
     def __init__(self, *args, **kwargs):
         # Set the directory to serve from
         super().__init__(*args, directory=str(CACHE_DIR), **kwargs)
@@ -46,21 +72,78 @@ class CacheHTTPHandler(SimpleHTTPRequestHandler):
         # Suppress logging to keep console clean
         pass
     
+    # CORS (for local access) and caching headers, added to every response
+    EXTRA_HEADERS = b"Access-Control-Allow-Origin: *\r\nCache-Control: no-cache\r\n"
+    
     def end_headers(self):
-        # Add CORS headers for local access
-        self.send_header('Access-Control-Allow-Origin', '*')
-        self.send_header('Cache-Control', 'no-cache')
+        self._headers_buffer.append(self.EXTRA_HEADERS)
         super().end_headers()
+    
+    def do_GET(self):
+        if urllib.parse.urlsplit(self.path).path in ("/", "/player.html"):
+            self.send_player_page()
+        else:
+            super().do_GET()
+    
+    def do_HEAD(self):
+        if urllib.parse.urlsplit(self.path).path in ("/", "/player.html"):
+            self.send_player_page(body=False)
+        else:
+            super().do_HEAD()
+    
+    def send_player_page(self, body=True):
+        """Serve the player page from memory, gzipped when the browser accepts it"""
+        gzipped = "gzip" in self.headers.get("Accept-Encoding", "")
+        data = PLAYER_HTML_GZ if gzipped else PLAYER_HTML
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        if gzipped:
+            self.send_header("Content-Encoding", "gzip")
+        self.send_header("Vary", "Accept-Encoding")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        if body:
+            self.wfile.write(data)
+    
+    def copyfile(self, source, outputfile):
+        # Let the kernel copy file -> socket (os.sendfile) rather than
+        # shuttling every video through Python buffers; socket.sendfile
+        # falls back to a send loop where that isn't available
+        self.connection.sendfile(source)
+
+
+class CacheHTTPServer(ThreadingHTTPServer):
+    """Serves each connection on its own thread, so the page can fetch the
+    next item while the current video is still streaming"""
+    
+    daemon_threads = True
+    request_queue_size = 128
+    
+    def get_request(self):
+        conn, addr = super().get_request()
+        # Responses are small header writes followed by sendfile; don't let
+        # Nagle hold them back on loopback
+        conn.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        return conn, addr
+
+
+# Set once the local server is listening (local_server) or failed to start
+local_server = None
+local_server_ready = threading.Event()
 
 
 def start_local_server():
     """Start local HTTP server in background thread"""
+    global local_server
     try:
-        server = HTTPServer(('127.0.0.1', LOCAL_SERVER_PORT), CacheHTTPHandler)
+        server = CacheHTTPServer(('127.0.0.1', LOCAL_SERVER_PORT), CacheHTTPHandler)
         print(f"Local cache server running on http://127.0.0.1:{LOCAL_SERVER_PORT}")
+        local_server = server
+        local_server_ready.set()
         server.serve_forever()
     except Exception as e:
         print(f"Failed to start local server: {e}")
+        local_server_ready.set()
 
 
 # Start local server in background
@@ -68,6 +151,125 @@ local_server_thread = threading.Thread(target=start_local_server, daemon=True)
 local_server_thread.start()
 
 
+class HTTPResponse:
+    """Response from HTTPPool.request (data is empty when the body was streamed)"""
+    
+    def __init__(self, status, headers, data):
+        self.status = status
+        self.headers = headers
+        self.data = data
+
+
+@functools.lru_cache(maxsize=64)
+def _split_url(url):
+    """((scheme, netloc), path) for a request URL - the player requests the
+    same few URLs over and over, so each is only parsed once"""
+    parts = urllib.parse.urlsplit(url)
+    path = parts.path or "/"
+    if parts.query:
+        path += "?" + parts.query
+    return (parts.scheme, parts.netloc), path
+
+
+class HTTPPool:
+    """Keep-alive HTTP/1.1 connections to the signage server
+    
+    The player polls the same host continuously; reusing idle connections
+    skips the TCP (and TLS) handshake on every request. pywebview calls the
+    API from a new thread each time, so connections are shared between
+    threads rather than kept per thread.
+    """
+    
+    def __init__(self, maxsize=4):
+        self.maxsize = maxsize
+        self._idle = {}
+        self._lock = threading.Lock()
+    
+    def _get_connection(self, key, timeout):
+        with self._lock:
+            idle = self._idle.get(key)
+            if idle:
+                conn = idle.pop()
+                if conn.sock:
+                    conn.sock.settimeout(timeout)
+                conn.timeout = timeout
+                return conn, True
+        scheme, netloc = key
+        if scheme == "https":
+            return http.client.HTTPSConnection(netloc, timeout=timeout), False
+        return http.client.HTTPConnection(netloc, timeout=timeout), False
+    
+    def _put_connection(self, key, conn):
+        with self._lock:
+            idle = self._idle.setdefault(key, [])
+            if len(idle) < self.maxsize:
+                idle.append(conn)
+                return
+        conn.close()
+    
+    @staticmethod
+    def _stream(response, sink):
+        """Copy a response body to a file through one reused buffer
+        
+        Reads are sized to about 1% of the body (8 KiB - 1 MiB), so small
+        images don't over-allocate and large videos don't take thousands
+        of tiny reads.
+        """
+        length = response.length
+        size = max(8 * 1024, min(1024 * 1024, length // 100)) if length else DOWNLOAD_CHUNK_SIZE
+        buf = bytearray(size)
+        view = memoryview(buf)
+        while True:
+            n = response.readinto(buf)
+            if not n:
+                break
+            sink.write(view[:n])
+        # readinto() just stops if the connection drops mid-body
+        if response.length:
+            raise http.client.IncompleteRead(b"", response.length)
+    
+    def request(self, method, url, body=None, headers=None, timeout=10, sink=None):
+        """Send a request and read the response
+        
+        With `sink`, a successful response body is streamed to a file
+        instead of held in memory. `sink` is a binary file, or a callable
+        that is given the response and returns the file to write to.
+        """
+        key, path = _split_url(url)
+        
+        while True:
+            conn, reused = self._get_connection(key, timeout)
+            streamed = False
+            try:
+                conn.request(method, path, body=body, headers=headers or {})
+                response = conn.getresponse()
+                if sink is not None and 200 <= response.status < 300:
+                    streamed = True
+                    self._stream(response, sink(response) if callable(sink) else sink)
+                    data = b""
+                else:
+                    data = response.read()
+            except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+                conn.close()
+                # The server closed an idle connection - retry on a fresh one
+                # (unless the body had already started going to the sink)
+                if reused and not streamed:
+                    continue
+                raise
+            except Exception:
+                conn.close()
+                raise
+            
+            if response.will_close:
+                conn.close()
+            else:
+                self._put_connection(key, conn)
+            return HTTPResponse(response.status, response.headers, data)
+
+
+http_pool = HTTPPool()
+
+
 class Config:
     def __init__(self):
         self.server_url = DEFAULT_SERVER
@@ -75,31 +277,58 @@ class Config:
         self.device_name = None
         self.fullscreen = True
         self.debug = False
+        self._saved_hash = None  # Digest of what's on disk, to skip no-op saves
+        self._as_dict_cached = {}
         self.load()
     
+    def _serialize(self):
+        return _dumps({
+            "server_url": self.server_url,
+            "access_code": self.access_code,
+            "device_name": self.device_name,
+            "fullscreen": self.fullscreen,
+            "debug": self.debug,
+        })
+    
     def load(self):
         if CONFIG_FILE.exists():
             try:
-                with open(CONFIG_FILE) as f:
-                    data = json.load(f)
+                with open(CONFIG_FILE, "rb") as f:
+                    data = _loads(f.read())
                     self.server_url = data.get("server_url", DEFAULT_SERVER)
                     self.access_code = data.get("access_code")
                     self.device_name = data.get("device_name")
                     self.fullscreen = data.get("fullscreen", True)
                     self.debug = data.get("debug", False)
+                self._saved_hash = _digest(self._serialize())
             except Exception as e:
                 print(f"Error loading config: {e}")
+        self._update_cached_dict()
+    
+    def _update_cached_dict(self):
+        # What get_config hands the page, rebuilt only when settings change
+        self._as_dict_cached = {
+            "server_url": self.server_url,
+            "access_code": self.access_code,
+            "device_name": self.device_name,
+            "is_connected": self.access_code is not None,
+            "debug": self.debug,
+        }
     
     def save(self):
+        self._update_cached_dict()
         try:
-            with open(CONFIG_FILE, "w") as f:
-                json.dump({
-                    "server_url": self.server_url,
-                    "access_code": self.access_code,
-                    "device_name": self.device_name,
-                    "fullscreen": self.fullscreen,
-                    "debug": self.debug,
-                }, f, indent=2)
+            payload = self._serialize()
+            h = _digest(payload)
+            if h == self._saved_hash:
+                return
+            # Write to a temp file and swap it in so a power cut can't
+            # leave a truncated config behind
+            tmp_file = CONFIG_FILE.with_suffix(".tmp")
+            with open(tmp_file, "wb") as f:
+                f.write(payload)
+            os.replace(tmp_file, CONFIG_FILE)
+            self._saved_hash = h
         except Exception as e:
             print(f"Error saving config: {e}")
     
@@ -114,131 +343,335 @@ config = Config()
 
 class ContentSyncManager:
     def __init__(self):
-        self.manifest = {}
-        self.sync_in_progress = False
-        self.sync_progress = 0
-        self.sync_total = 0
-        self.sync_status = "idle"
-        self.load_manifest()
+        self._manifest = None  # Read from disk on first use, not at startup
+        # Sync progress for get_sync_status. The sync thread only ever swaps
+        # in a new dict, so readers always see a consistent snapshot
+        self._status = {"in_progress": False, "progress": 0, "total": 0, "status": "idle"}
+        # Downloads run on several threads (and splash sync on its own), so
+        # manifest changes go through this lock
+        self._lock = threading.RLock()
+        self._manifest_dirty = False  # In-memory manifest has unsaved changes
+        # filename -> local path / file:// URL for files known to be on disk.
+        # The API answers from these on every poll without touching the
+        # filesystem; they change only when a file is downloaded or removed.
+        self._paths = {}
+        self._file_urls = {}
+        self.version = 0  # Bumped whenever the set of cached files changes
+        self._clock_base = None  # (datetime, monotonic) pair, reset per sync
+        # Playlist syncs run one at a time (polls can start one every few
+        # seconds); a request that arrives mid-sync is kept here and run
+        # once the current sync finishes, latest request wins
+        self._syncing = False
+        self._queued_sync = None
+    
+    @property
+    def manifest(self):
+        if self._manifest is None:
+            self.load_manifest()
+        return self._manifest
     
     def load_manifest(self):
+        manifest = {}
         manifest_file = CACHE_DIR / "manifest.json"
         if manifest_file.exists():
             try:
-                with open(manifest_file) as f:
-                    self.manifest = json.load(f)
+                with open(manifest_file, "rb") as f:
+                    manifest = _loads(f.read())
             except:
-                self.manifest = {}
+                manifest = {}
+        with self._lock:
+            self._paths = {
+                name: entry["local_path"] for name, entry in manifest.items()
+                if os.path.exists(entry.get("local_path", ""))
+            }
+            self._file_urls = {}
+            self._manifest = manifest
+            self.version += 1
+    
+    def _forget(self, filename):
+        """Drop a file from the manifest and the path caches"""
+        with self._lock:
+            if self.manifest.pop(filename, None):
+                self._manifest_dirty = True
+            self._paths.pop(filename, None)
+            self._file_urls.pop(filename, None)
+            self.version += 1
     
     def save_manifest(self):
         manifest_file = CACHE_DIR / "manifest.json"
+        tmp_file = manifest_file.with_suffix(".tmp")
         try:
-            with open(manifest_file, "w") as f:
-                json.dump(self.manifest, f, indent=2)
+            # Swap in a complete file so a power cut mid-write can't lose
+            # the whole manifest
+            with self._lock:
+                with open(tmp_file, "wb") as f:
+                    f.write(_dumps(self.manifest))
+                os.replace(tmp_file, manifest_file)
+                self._manifest_dirty = False
         except Exception as e:
             print(f"Error saving manifest: {e}")
     
-    def is_cached(self, filename, expected_size=None):
-        if filename not in self.manifest:
+    def flush_manifest(self):
+        """Save the manifest if anything changed since it was last written"""
+        if self._manifest_dirty:
+            self.save_manifest()
+    
+    @staticmethod
+    def _scan(directory):
+        """Stat every file in a directory in one pass, keyed by path"""
+        try:
+            with os.scandir(directory) as entries:
+                return {e.path: e.stat() for e in entries if e.is_file()}
+        except OSError:
+            return {}
+    
+    def is_cached(self, filename, expected_size=None, present=None):
+        """Whether the manifest's copy of `filename` is on disk and intact
+        
+        `present` is an optional _scan() of the file's directory, so a sync
+        can check many files without a stat call for each.
+        """
+        entry = self.manifest.get(filename)
+        if not entry:
+            return False
+        local_path = entry.get("local_path", "")
+        try:
+            st = present.get(local_path) if present is not None else None
+            if st is None:
+                st = os.stat(local_path)
+        except OSError:
+            with self._lock:
+                if self._paths.pop(filename, None):
+                    self.version += 1
+                self._file_urls.pop(filename, None)
+            return False
+        # One stat instead of hashing: a file whose size or mtime no longer
+        # matches what we downloaded is treated as stale and fetched again
+        if st.st_size != entry.get("size", st.st_size):
             return False
-        local_path = Path(self.manifest[filename].get("local_path", ""))
-        if not local_path.exists():
+        if "mtime_ns" in entry and st.st_mtime_ns != entry["mtime_ns"]:
             return False
-        if expected_size and local_path.stat().st_size != expected_size:
+        if expected_size and st.st_size != expected_size:
             return False
         return True
     
     def get_local_path(self, filename):
-        if filename in self.manifest:
-            local_path = Path(self.manifest[filename].get("local_path", ""))
-            if local_path.exists():
-                return str(local_path)
-        return None
+        if self._manifest is None:
+            self.load_manifest()
+        return self._paths.get(filename)
+    
+    def get_file_url(self, filename):
+        """file:// URL of a cached file, or None"""
+        if self._manifest is None:
+            self.load_manifest()
+        url = self._file_urls.get(filename)
+        if url is None:
+            local_path = self._paths.get(filename)
+            if local_path:
+                url = self._file_urls[filename] = "file:///" + local_path.replace("\\", "/")
+        return url
     
     def download_file(self, url, filename, file_size=None, content_type="content"):
         try:
             target_dir = SPLASH_DIR if content_type == "splash" else CONTENT_DIR
             local_path = target_dir / filename
             print(f"Downloading: {filename}")
-            urllib.request.urlretrieve(url, local_path)
-            self.manifest[filename] = {
-                "local_path": str(local_path),
-                "url": url,
-                "size": local_path.stat().st_size,
-                "synced_at": datetime.now().isoformat(),
-            }
-            self.save_manifest()
+            # Download beside the target and swap it in, so the local server
+            # never serves a half-written file
+            tmp_path = local_path.with_name(local_path.name + ".part")
+            headers = {}
+            # A copy we already have only needs re-validating (e.g. it was
+            # touched on disk since it was downloaded) - but only if it is
+            # still the size we downloaded; a damaged copy is fetched again
+            entry = self.manifest.get(filename)
+            if entry and local_path.exists():
+                if self._intact(local_path, entry, file_size):
+                    if entry.get("etag"):
+                        headers["If-None-Match"] = entry["etag"]
+                else:
+                    local_path.unlink(missing_ok=True)
+                    self._forget(filename)
+                    entry = None
+            # A .part left by an interrupted sync is resumed, not restarted.
+            # Uploaded files get a fresh name, so the bytes behind a
+            # filename never change on the server.
+            offset = tmp_path.stat().st_size if tmp_path.exists() else 0
+            if offset and (not file_size or offset < file_size):
+                headers["Range"] = f"bytes={offset}-"
+            
+            def target(response):
+                # Anything but a partial response is the whole file again
+                if response.status != 206:
+                    f.seek(0)
+                    f.truncate()
+                return f
+            
+            with open(tmp_path, "ab") as f:
+                # Same keep-alive connections as the API calls, so a playlist
+                # of N files costs one handshake rather than N
+                response = http_pool.request("GET", url, headers=headers, timeout=30, sink=target)
+            
+            if response.status == 304:
+                tmp_path.unlink(missing_ok=True)
+                if not entry or not self._intact(local_path, entry, file_size):
+                    local_path.unlink(missing_ok=True)
+                    self._forget(filename)
+                    raise OSError("Cached copy changed while revalidating")
+                self._record(filename, local_path, url, entry["etag"])
+                return str(local_path)
+            if response.status == 206:
+                content_range = response.headers.get("Content-Range", "")
+                if not content_range.startswith(f"bytes {offset}-"):
+                    tmp_path.unlink(missing_ok=True)
+                    raise OSError(f"Unexpected range {content_range!r}")
+            elif response.status != 200:
+                tmp_path.unlink(missing_ok=True)
+                raise OSError(f"HTTP {response.status}")
+            if file_size and tmp_path.stat().st_size != file_size:
+                tmp_path.unlink(missing_ok=True)
+                raise OSError("Downloaded size doesn't match the playlist")
+            os.replace(tmp_path, local_path)
+            self._record(filename, local_path, url, response.headers.get("ETag"))
             return str(local_path)
         except Exception as e:
             print(f"Download error for {filename}: {e}")
             return None
     
+    @staticmethod
+    def _intact(local_path, entry, file_size=None):
+        """Whether a cached file is still the size it was downloaded at"""
+        try:
+            size = local_path.stat().st_size
+        except OSError:
+            return False
+        return size == entry.get("size", size) and (not file_size or size == file_size)
+    
+    def _timestamp(self):
+        """Wall-clock time as an ISO string, for the manifest
+        
+        Read once per sync and advanced with the monotonic clock after that,
+        so an NTP step mid-sync can't put files out of order.
+        """
+        base = self._clock_base
+        if base is None:
+            base = self._clock_base = (datetime.now(), time.monotonic())
+        return (base[0] + timedelta(seconds=time.monotonic() - base[1])).isoformat()
+    
+    def _record(self, filename, local_path, url, etag=None):
+        """Add a file that just landed in the cache to the manifest"""
+        st = local_path.stat()
+        with self._lock:
+            self.manifest[filename] = {
+                "local_path": str(local_path),
+                "url": url,
+                "size": st.st_size,
+                "mtime_ns": st.st_mtime_ns,
+                "etag": etag,
+                "synced_at": self._timestamp(),
+            }
+            # Written once at the end of the sync, not per file
+            self._manifest_dirty = True
+            self._paths[filename] = str(local_path)
+            self._file_urls.pop(filename, None)
+            self.version += 1
+    
     def sync_playlist(self, playlist, server_url, progress_callback=None):
-        self.sync_in_progress = True
-        self.sync_total = len(playlist)
-        self.sync_progress = 0
-        self.sync_status = "syncing"
+        """Sync the cache to a playlist, or queue the sync if one is running
+        
+        Returns the synced filenames, or None if the sync was queued.
+        """
+        with self._lock:
+            if self._syncing:
+                self._queued_sync = (playlist, server_url)
+                return None
+            self._syncing = True
+        try:
+            while True:
+                synced_files = self._sync_playlist(playlist, server_url)
+                with self._lock:
+                    if self._queued_sync is None:
+                        self._syncing = False
+                        return synced_files
+                    playlist, server_url = self._queued_sync
+                    self._queued_sync = None
+        except BaseException:
+            with self._lock:
+                self._syncing = False
+            raise
+    
+    def _sync_playlist(self, playlist, server_url):
+        total = len(playlist)
+        progress = 0
+        self._clock_base = None
+        self._status = {"in_progress": True, "progress": 0, "total": total, "status": "syncing"}
         synced_files = []
         
-        for i, item in enumerate(playlist):
-            self.sync_progress = i + 1
+        missing = []
+        present = self._scan(CONTENT_DIR)
+        for item in playlist:
             filename = item.get("filename")
             file_size = item.get("file_size")
-            relative_url = item.get("url", "")
-            
-            if self.is_cached(filename, file_size):
+            if self.is_cached(filename, file_size, present):
                 print(f"Already cached: {filename}")
                 synced_files.append(filename)
-                continue
-            
-            full_url = server_url + relative_url
-            local_path = self.download_file(full_url, filename, file_size, "content")
-            if local_path:
-                synced_files.append(filename)
+                progress += 1
+            else:
+                missing.append((server_url + item.get("url", ""), filename, file_size))
         
-        self.cleanup_unused(synced_files, CONTENT_DIR)
-        self.sync_in_progress = False
-        self.sync_status = "complete"
+        # Fetch what's missing a few files at a time, so one large video
+        # doesn't hold up everything queued behind it
+        if missing:
+            self._status = {"in_progress": True, "progress": progress, "total": total, "status": "syncing"}
+            with ThreadPoolExecutor(SYNC_WORKERS, "player-sync") as pool:
+                futures = {
+                    pool.submit(self.download_file, url, filename, file_size, "content"): filename
+                    for url, filename, file_size in missing
+                }
+                for future in as_completed(futures):
+                    if future.result():
+                        synced_files.append(futures[future])
+                    progress += 1
+                    self._status = {"in_progress": True, "progress": progress, "total": total, "status": "syncing"}
+        
+        self.cleanup_unused(synced_files, CONTENT_DIR, [filename for _, filename, _ in missing])
+        self.flush_manifest()
+        self._status = {"in_progress": False, "progress": total, "total": total, "status": "complete"}
         return synced_files
     
     def sync_splash_content(self, splash_config, server_url):
         if not splash_config:
             return
-        if splash_config.get("logo_filename"):
-            filename = splash_config["logo_filename"]
-            if not self.is_cached(filename):
-                url = server_url + splash_config.get("logo_url", "")
-                self.download_file(url, filename, None, "splash")
-        if splash_config.get("background_video_filename"):
-            filename = splash_config["background_video_filename"]
-            if not self.is_cached(filename):
-                url = server_url + splash_config.get("background_video_url", "")
-                self.download_file(url, filename, None, "splash")
-        for bg in splash_config.get("backgrounds", []):
-            filename = bg.get("filename")
-            if filename and not self.is_cached(filename):
-                url = server_url + bg.get("url", "")
-                self.download_file(url, filename, None, "splash")
-    
-    def cleanup_unused(self, keep_files, directory):
+        present = self._scan(SPLASH_DIR)
+        self._clock_base = None
+        jobs = []
+        for key in ("logo", "background_video"):
+            if splash_config.get(f"{key}_filename"):
+                jobs.append((splash_config[f"{key}_filename"], splash_config.get(f"{key}_url", "")))
+        jobs += [(bg["filename"], bg.get("url", "")) for bg in splash_config.get("backgrounds", []) if bg.get("filename")]
+        missing = [(filename, url) for filename, url in jobs if not self.is_cached(filename, present=present)]
+        if missing:
+            with ThreadPoolExecutor(SYNC_WORKERS, "player-sync") as pool:
+                for filename, url in missing:
+                    pool.submit(self.download_file, server_url + url, filename, None, "splash")
+        self.flush_manifest()
+    
+    def cleanup_unused(self, keep_files, directory, resumable=()):
+        """Delete files not in keep_files, except .part downloads of files
+        in `resumable`, which the next sync picks up where they stopped"""
+        keep_files = set(keep_files)
+        keep_files.update(f"{name}.part" for name in resumable)
         try:
             for file in directory.iterdir():
                 if file.is_file() and file.name not in keep_files:
                     print(f"Removing unused: {file.name}")
                     file.unlink()
-                    if file.name in self.manifest:
-                        del self.manifest[file.name]
-            self.save_manifest()
+                    self._forget(file.name)
+            self.flush_manifest()
         except Exception as e:
             print(f"Cleanup error: {e}")
     
     def get_sync_status(self):
-        return {
-            "in_progress": self.sync_in_progress,
-            "progress": self.sync_progress,
-            "total": self.sync_total,
-            "status": self.sync_status,
-        }
+        return self._status
 
 
 sync_manager = ContentSyncManager()
@@ -251,138 +684,241 @@ class PlayerAPI:
         self.orientation = "landscape"
         self.flip_horizontal = False
         self.flip_vertical = False
-    
-    def get_config(self):
+        # Last server responses and their ETags, reused when the server
+        # answers 304 Not Modified
+        self._playlist_etag = None
+        self._playlist_result = None
+        self._display_etag = None
+        self._display_result = None
+        # Playlist as handed to the page (with local paths filled in), and
+        # the server result / cache state it was built from
+        self._local_playlist = []
+        self._local_playlist_source = None
+        self._local_playlist_key = None
+        # Remote content URL prefix, rebuilt only when the server changes
+        self._content_prefix = f"{config.server_url}/uploads/content/"
+        # Server requests run here so a hung server can't hold a JS call
+        # open past REQUEST_DEADLINE
+        self._pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="player-net")
+        # key -> future of the latest fetch of each endpoint
+        self._inflight = {}
+        self._inflight_lock = threading.Lock()
+    
+    def _call(self, fn, *args):
+        return self._wait(self._pool.submit(fn, *args))
+    
+    def _shared(self, key, fn):
+        """Future for fn(), shared with an identical fetch that is still running
+        
+        The page can ask for the same thing from several places at once
+        (startup, polling, server pushes); they all get one request. A
+        finished fetch is never reused, so a call made after a change (a
+        server push) always sees it.
+        """
+        with self._inflight_lock:
+            future = self._inflight.get(key)
+            if future is None or future.done():
+                future = self._inflight[key] = self._pool.submit(fn)
+            return future
+    
+    def _forget_fetches(self):
+        with self._inflight_lock:
+            self._inflight.clear()
+    
+    def _wait(self, future):
+        try:
+            return future.result(timeout=REQUEST_DEADLINE)
+        except (FutureTimeoutError, CancelledError):
+            future.cancel()
+            return {"success": False, "error": "Request timed out"}
+    
+    @staticmethod
+    def _device_settings(device):
+        """Display settings the page applies, from a server device dict"""
         return {
-            "server_url": config.server_url,
-            "access_code": config.access_code,
-            "device_name": config.device_name,
-            "is_connected": config.access_code is not None,
+            "orientation": device.get("orientation", "landscape"),
+            "flip_horizontal": device.get("flip_horizontal", False),
+            "flip_vertical": device.get("flip_vertical", False),
+            "background_mode": device.get("background_mode", "solid"),
+            "background_color": device.get("background_color", "#000000"),
         }
     
+    @staticmethod
+    def _ws_url():
+        """Server push channel for this device (ws:// or wss:// to match the server)"""
+        if not config.access_code:
+            return None
+        return "ws" + config.server_url[len("http"):] + f"/ws/{config.access_code}"
+    
+    def get_config(self):
+        c = dict(config._as_dict_cached)
+        c["content_prefix"] = self._content_prefix
+        c["ws_url"] = self._ws_url()
+        return c
+    
     def register(self, server_url, access_code):
+        self._forget_fetches()
+        return self._call(self._do_register, server_url, access_code)
+    
+    def _do_register(self, server_url, access_code):
         config.server_url = server_url.rstrip("/")
+        self._content_prefix = f"{config.server_url}/uploads/content/"
         try:
             data = urllib.parse.urlencode({"access_code": access_code}).encode()
-            req = urllib.request.Request(f"{config.server_url}/api/player/register", data=data, method="POST")
-            with urllib.request.urlopen(req, timeout=10) as response:
-                result = json.loads(response.read())
-                if result.get("success"):
-                    config.access_code = access_code
-                    config.device_name = result.get("device_name")
-                    config.save()
-                    return {"success": True, "device_name": config.device_name}
-                return {"success": False, "error": "Registration failed"}
-        except urllib.error.HTTPError as e:
-            try:
-                error_data = json.loads(e.read().decode())
-                return {"success": False, "error": error_data.get("detail", "Invalid access code")}
-            except:
-                return {"success": False, "error": f"HTTP {e.code}"}
+            headers = {"Content-Type": "application/x-www-form-urlencoded"}
+            response = http_pool.request("POST", f"{config.server_url}/api/player/register", body=data, headers=headers)
+            if response.status >= 400:
+                try:
+                    error_data = _loads(response.data)
+                    return {"success": False, "error": error_data.get("detail", "Invalid access code")}
+                except:
+                    return {"success": False, "error": f"HTTP {response.status}"}
+            result = _loads(response.data)
+            if result.get("success"):
+                config.access_code = access_code
+                config.device_name = result.get("device_name")
+                config.save()
+                return {"success": True, "device_name": config.device_name, "content_prefix": self._content_prefix, "ws_url": self._ws_url()}
+            return {"success": False, "error": "Registration failed"}
         except Exception as e:
             return {"success": False, "error": str(e)}
     
     def disconnect(self):
         config.clear()
         self.playlist = []
+        self._playlist_etag = self._playlist_result = None
+        self._display_etag = self._display_result = None
+        self._forget_fetches()
         return {"success": True}
     
     def get_playlist(self):
+        return self._wait(self._shared("playlist", self._do_get_playlist))
+    
+    def forget_playlist_etag(self):
+        """Make the next playlist fetch a full one (the page discarded a
+        changed playlist it had been sent, so a 304 would hide the change)"""
+        self._playlist_etag = None
+        return {"success": True}
+    
+    def _do_get_playlist(self):
         if not config.access_code:
             return {"success": False, "error": "Not connected"}
         try:
-            req = urllib.request.Request(f"{config.server_url}/api/player/{config.access_code}/playlist")
-            with urllib.request.urlopen(req, timeout=10) as response:
-                result = json.loads(response.read())
-                self.playlist = result.get("playlist", [])
-                device_config = result.get("device", {})
-                self.orientation = device_config.get("orientation", "landscape")
-                self.flip_horizontal = device_config.get("flip_horizontal", False)
-                self.flip_vertical = device_config.get("flip_vertical", False)
-                
-                # Get transition settings
-                transition = result.get("transition", {})
-                transition_type = transition.get("type", "cut")
-                transition_duration = transition.get("duration", 0.5)
-                
-                # Get sync settings
-                sync_info = result.get("sync", {})
-                
-                if self.playlist:
-                    threading.Thread(target=sync_manager.sync_playlist, args=(self.playlist, config.server_url), daemon=True).start()
-                
+            headers = {"If-None-Match": self._playlist_etag} if self._playlist_etag else {}
+            response = http_pool.request("GET", f"{config.server_url}/api/player/{config.access_code}/playlist", headers=headers, timeout=10)
+            unchanged = response.status == 304 and self._playlist_result is not None
+            if unchanged:
+                result = self._playlist_result
+            elif response.status != 200:
+                return {"success": False, "error": f"HTTP {response.status}"}
+            else:
+                result = _loads(response.data)
+                self._playlist_result = result
+                self._playlist_etag = response.headers.get("ETag")
+            server_url = config.server_url
+            self.playlist = result.get("playlist", [])
+            settings = self._device_settings(result.get("device", {}))
+            self.orientation = settings["orientation"]
+            self.flip_horizontal = settings["flip_horizontal"]
+            self.flip_vertical = settings["flip_vertical"]
+            
+            # Get transition settings
+            transition = result.get("transition", {})
+            transition_type = transition.get("type", "cut")
+            transition_duration = transition.get("duration", 0.5)
+            
+            # Get sync settings
+            sync_info = result.get("sync", {})
+            
+            if self.playlist:
+                threading.Thread(target=sync_manager.sync_playlist, args=(self.playlist, server_url), daemon=True).start()
+            
+            # Rebuild the page's copy of the playlist only when the playlist
+            # or the set of cached files actually changed
+            key = (server_url, sync_manager.version)
+            if self._local_playlist_source is not result or self._local_playlist_key != key:
                 local_playlist = []
                 for item in self.playlist:
-                    local_item = item.copy()
                     local_path = sync_manager.get_local_path(item.get("filename"))
                     if local_path:
-                        local_item["local_path"] = local_path
-                        local_item["use_local"] = True
+                        local_playlist.append({**item, "local_path": local_path, "use_local": True})
                     else:
-                        local_item["use_local"] = False
-                        local_item["remote_url"] = config.server_url + item.get("url", "")
-                    local_playlist.append(local_item)
-                
-                return {
-                    "success": True,
-                    "playlist": local_playlist,
-                    "active_schedule": result.get("active_schedule"),
-                    "orientation": self.orientation,
-                    "flip_horizontal": self.flip_horizontal,
-                    "flip_vertical": self.flip_vertical,
-                    "transition_type": transition_type,
-                    "transition_duration": transition_duration,
-                    "sync": sync_info,  # Pass sync info to JS
-                    "debug": result.get("debug"),
-                    "server_url": config.server_url,
-                }
+                        local_playlist.append({**item, "use_local": False, "remote_url": server_url + item.get("url", "")})
+                self._local_playlist = local_playlist
+                self._local_playlist_source = result
+                self._local_playlist_key = key
+            local_playlist = self._local_playlist
+            
+            return {
+                "success": True,
+                "unchanged": unchanged,
+                "playlist": local_playlist,
+                "active_schedule": result.get("active_schedule"),
+                **settings,
+                "transition_type": transition_type,
+                "transition_duration": transition_duration,
+                "sync": sync_info,  # Pass sync info to JS
+                "playlist_version": result.get("playlist_version"),
+                "debug": result.get("debug"),
+                "server_url": server_url,
+            }
         except Exception as e:
             return {"success": False, "error": str(e)}
     
     def get_default_display(self):
+        return self._wait(self._shared("default_display", self._do_get_default_display))
+    
+    def _do_get_default_display(self):
         if not config.access_code:
             return {"success": False, "error": "Not connected"}
         try:
-            req = urllib.request.Request(f"{config.server_url}/api/player/{config.access_code}/config")
-            with urllib.request.urlopen(req, timeout=10) as response:
-                result = json.loads(response.read())
-                default_display = result.get("default_display", {})
-                
-                if default_display:
-                    threading.Thread(target=sync_manager.sync_splash_content, args=(default_display, config.server_url), daemon=True).start()
-                    if default_display.get("logo_filename"):
-                        default_display["logo_local_path"] = sync_manager.get_local_path(default_display["logo_filename"])
-                    if default_display.get("background_video_filename"):
-                        default_display["background_video_local_path"] = sync_manager.get_local_path(default_display["background_video_filename"])
-                    for bg in default_display.get("backgrounds", []):
-                        bg["local_path"] = sync_manager.get_local_path(bg.get("filename"))
-                
-                device = result.get("device", {})
-                return {
-                    "success": True,
-                    "default_display": default_display,
-                    "server_url": config.server_url,
-                    "orientation": device.get("orientation", "landscape"),
-                    "flip_horizontal": device.get("flip_horizontal", False),
-                    "flip_vertical": device.get("flip_vertical", False),
-                }
+            headers = {"If-None-Match": self._display_etag} if self._display_etag else {}
+            response = http_pool.request("GET", f"{config.server_url}/api/player/{config.access_code}/config", headers=headers, timeout=10)
+            unchanged = response.status == 304 and self._display_result is not None
+            if unchanged:
+                result = self._display_result
+            elif response.status != 200:
+                return {"success": False, "error": f"HTTP {response.status}"}
+            else:
+                result = _loads(response.data)
+                self._display_result = result
+                self._display_etag = response.headers.get("ETag")
+            server_url = config.server_url
+            default_display = result.get("default_display", {})
+            
+            if default_display:
+                threading.Thread(target=sync_manager.sync_splash_content, args=(default_display, server_url), daemon=True).start()
+                if default_display.get("logo_filename"):
+                    default_display["logo_local_path"] = sync_manager.get_local_path(default_display["logo_filename"])
+                if default_display.get("background_video_filename"):
+                    default_display["background_video_local_path"] = sync_manager.get_local_path(default_display["background_video_filename"])
+                for bg in default_display.get("backgrounds", []):
+                    bg["local_path"] = sync_manager.get_local_path(bg.get("filename"))
+            
+            return {
+                "success": True,
+                "unchanged": unchanged,
+                "default_display": default_display,
+                "server_url": server_url,
+                **self._device_settings(result.get("device", {})),
+            }
         except Exception as e:
             return {"success": False, "error": str(e)}
     
+    def get_boot_state(self):
+        """Playlist and splash config fetched concurrently, for the first load"""
+        playlist = self._shared("playlist", self._do_get_playlist)
+        default_display = self._shared("default_display", self._do_get_default_display)
+        return {"playlist": self._wait(playlist), "default_display": self._wait(default_display)}
+    
     def get_sync_status(self):
         return sync_manager.get_sync_status()
     
     def get_local_file_url(self, filename):
-        local_path = sync_manager.get_local_path(filename)
-        if local_path:
-            return "file:///" + local_path.replace("\\", "/")
-        return None
+        return sync_manager.get_file_url(filename)
     
     def get_content_url(self, filename):
-        local_path = sync_manager.get_local_path(filename)
-        if local_path:
-            return "file:///" + local_path.replace("\\", "/")
-        return f"{config.server_url}/uploads/content/{filename}"
+        return sync_manager.get_file_url(filename) or self._content_prefix + filename
     
     def get_screen_info(self):
         return {"width": 1920, "height": 1080}
@@ -393,19 +929,24 @@ class PlayerAPI:
             return {"success": False, "error": "Not connected"}
         try:
             client_send_time = time.time()
-            req = urllib.request.Request(f"{config.server_url}/api/time")
-            with urllib.request.urlopen(req, timeout=5) as response:
-                result = json.loads(response.read())
-                return {
-                    "success": True,
-                    "server_time": result.get("time"),
-                    "client_send_time": client_send_time,
-                }
+            response = http_pool.request("GET", f"{config.server_url}/api/time", timeout=5)
+            if response.status != 200:
+                return {"success": False, "error": f"HTTP {response.status}"}
+            result = _loads(response.data)
+            return {
+                "success": True,
+                "server_time": result.get("time"),
+                "client_send_time": client_send_time,
+            }
         except Exception as e:
             return {"success": False, "error": str(e)}
     
     def log(self, message):
         print(f"[JS] {message}")
+    
+    def log_batch(self, messages):
+        """Print a newline-separated batch of page log lines in one write"""
+        print("\n".join(f"[JS] {m}" for m in messages.split("\n")))
 
 
 def get_player_html():
@@ -420,8 +961,9 @@ html,body{background:#000;color:#fff;font-family:system-ui;overflow:hidden;width
 #background-layer{position:absolute;inset:0;z-index:0;overflow:hidden}
 #background-layer.solid{background-color:var(--bg-color, #000000)}
 #background-layer.blur img,#background-layer.blur video{position:absolute;width:100%;height:100%;object-fit:cover;filter:blur(50px) brightness(0.6);transform:scale(1.1)}
-.content-layer{position:absolute;inset:0;display:flex;align-items:center;justify-content:center;opacity:0;z-index:1;transition:opacity 0s;width:100%;height:100%}
-.content-layer.active{opacity:1}
+.content-layer{position:absolute;inset:0;display:flex;align-items:center;justify-content:center;opacity:0;visibility:hidden;z-index:1;transition:opacity 0s,visibility 0s;will-change:opacity;width:100%;height:100%}
+#content-layer-1{z-index:2}
+.content-layer.active{opacity:1;visibility:visible}
 .content-layer img,.content-layer video{max-width:100%;max-height:100%;width:auto;height:auto;object-fit:contain}
 .content-layer img.scale-fit,.content-layer video.scale-fit{max-width:100%;max-height:100%;width:auto;height:auto;object-fit:contain}
 .content-layer img.scale-fill,.content-layer video.scale-fill{max-width:none;max-height:none;width:100%;height:100%;object-fit:cover}
@@ -488,19 +1030,21 @@ html,body{background:#000;color:#fff;font-family:system-ui;overflow:hidden;width
 // ============================================================
 
 let playlist = [], currentIndex = 0, activeLayer = 0;
-let playbackTimer = null, pollTimer = null, syncCheckInterval = null;
+let playlistVersion = null;   // Identity of the playlist's item list (see playlistVersionOf)
+let playbackTimer = null, pollTimer = null, syncCheckTimer = null;
 let serverUrl = '';
+let contentPrefix = '';  // <server>/uploads/content/ - built once by Python
 
 // Sync timing variables
 let syncStartTime = 0;        // Unix timestamp when playlist cycle started
 let totalCycleDuration = 0;   // Total duration of one playlist cycle
-let serverTimeOffset = 0;     // Difference between server clock and local clock
+let serverTimeOffset = 0;     // Difference between server clock and local clock (see localClock)
 
 // Display settings
 let orientation = 'landscape', flipH = false, flipV = false;
 let backgroundMode = 'solid', backgroundColor = '#000000';
 let transitionType = 'cut', transitionDuration = 0.5;
-let debugMode = false, debugLog = [];
+let debugMode = false;
 
 // DOM elements
 const setupScreen = document.getElementById('setup-screen');
@@ -515,19 +1059,83 @@ const errorMessage = document.getElementById('error-message');
 const deviceNameDisplay = document.getElementById('device-name-display');
 const contentLayers = [document.getElementById('content-layer-0'), document.getElementById('content-layer-1')];
 const syncIndicator = document.getElementById('sync-indicator');
+const playerContainer = document.getElementById('player-container');
 const LOCAL_CACHE_URL = 'http://127.0.0.1:8089';
 
 // ============================================================
 // UTILITY FUNCTIONS
 // ============================================================
 
+// Log lines are forwarded to Python only when the player runs with debug
+// enabled, and then in batches rather than one IPC call per line
+let pyDebug = false;
+let logBuffer = [];
+let logFlushTimer = null;
+const LOG_FLUSH_INTERVAL = 250;   // ms a line may wait before being sent
+const LOG_FLUSH_LINES = 32;       // send straight away once this many are queued
+
+// Recent log lines for the debug overlay, kept in a fixed-size ring so
+// logging never has to shift the whole array (size is a power of two so
+// positions wrap with a mask)
+const DEBUG_LOG_SIZE = 256;
+const DEBUG_LOG_MASK = DEBUG_LOG_SIZE - 1;
+const debugLog = new Array(DEBUG_LOG_SIZE).fill('');
+let debugLogSeq = 0;   // Lines logged so far; also lets the overlay skip unchanged redraws
+
 function log(m) {
     const entry = `[${new Date().toLocaleTimeString()}] ${m}`;
-    debugLog.push(entry);
-    if (debugLog.length > 100) debugLog.shift();
+    debugLog[debugLogSeq++ & DEBUG_LOG_MASK] = entry;
     console.log(entry);
-    if (debugMode) updateDebug();
-    try { pywebview.api.log(m); } catch(e) {}
+    if (debugMode) scheduleDebug();
+    if (!pyDebug) return;
+    logBuffer.push(m);
+    if (logBuffer.length >= LOG_FLUSH_LINES) flushLogs();
+    else if (!logFlushTimer) logFlushTimer = setTimeout(flushLogs, LOG_FLUSH_INTERVAL);
+}
+
+// Routine progress messages are only worth recording when someone is
+// watching (the overlay, or the Python console in debug mode). Messages
+// that format numbers check verbose() first so nothing is built otherwise.
+function verbose() {
+    return debugMode || pyDebug;
+}
+
+function dlog(m) {
+    if (verbose()) log(m);
+}
+
+function flushLogs() {
+    clearTimeout(logFlushTimer);
+    logFlushTimer = null;
+    if (!logBuffer.length) return;
+    const batch = logBuffer;
+    logBuffer = [];
+    try { pywebview.api.log_batch(batch.join('\n')); } catch(e) {}
+}
+
+// The last n log lines, oldest first, one per line
+function tailLog(n) {
+    let out = '';
+    for (let i = Math.max(0, debugLogSeq - Math.min(n, DEBUG_LOG_SIZE)); i < debugLogSeq; i++) {
+        out += (out ? '\n' : '') + debugLog[i & DEBUG_LOG_MASK];
+    }
+    return out;
+}
+
+// The server's hash of the playlist's item ids, or a local FNV-1a hash of
+// them when talking to a server that doesn't send one
+function playlistVersionOf(r) {
+    if (r.playlist_version) return r.playlist_version;
+    const items = r.playlist || [];
+    let h = 0x811c9dc5;
+    for (let i = 0; i < items.length; i++) {
+        const id = String(items[i].id);
+        for (let j = 0; j < id.length; j++) {
+            h = Math.imul(h ^ id.charCodeAt(j), 0x01000193);
+        }
+        h = Math.imul(h ^ 44, 0x01000193);  // ',' between ids
+    }
+    return 'fnv:' + (h >>> 0).toString(16) + ':' + items.length;
 }
 
 function updateSyncIndicator(status, info = '') {
@@ -538,22 +1146,34 @@ function updateSyncIndicator(status, info = '') {
 
 function applyTransitionStyle() {
     const dur = transitionType === 'cut' ? 0 : transitionDuration;
-    contentLayers.forEach(l => { l.style.transition = `opacity ${dur}s ease-in-out`; });
+    // Visibility stays visible for the whole fade either way, then hides the
+    // outgoing layer so it isn't painted underneath
+    contentLayers.forEach(l => { l.style.transition = `opacity ${dur}s ease-in-out, visibility ${dur}s`; });
 }
 
+// Container transform for each (portrait, flipH, flipV) combination, indexed
+// by portrait<<2 | flipH<<1 | flipV. Flips apply first, then the portrait
+// rotation (90 degrees clockwise).
+const ORIENTATION_TRANSFORMS = [
+    'none', 'scaleY(-1)', 'scaleX(-1)', 'scaleX(-1) scaleY(-1)',
+    'rotate(90deg)', 'scaleY(-1) rotate(90deg)', 'scaleX(-1) rotate(90deg)', 'scaleX(-1) scaleY(-1) rotate(90deg)',
+];
+
+// Last applied orientation, flips and viewport size - repeat calls with the
+// same values skip the container style writes entirely
+let appliedOrientation = null;
+
 function applyOrientation() {
-    const c = document.getElementById('player-container');
-    let t = '';
+    const sig = `${orientation}|${flipH}|${flipV}|${window.innerWidth}x${window.innerHeight}`;
+    if (sig === appliedOrientation) return;
+    appliedOrientation = sig;
     
-    // Apply flips first
-    if (flipH) t += 'scaleX(-1) ';
-    if (flipV) t += 'scaleY(-1) ';
+    const c = playerContainer;
+    const portrait = orientation === 'portrait';
     
-    // Apply rotation for portrait mode (90 degrees clockwise)
-    if (orientation === 'portrait') {
+    if (portrait) {
         const vw = window.innerWidth;
         const vh = window.innerHeight;
-        t += 'rotate(90deg) ';
         // After rotation, swap dimensions to fill screen
         c.style.width = vh + 'px';
         c.style.height = vw + 'px';
@@ -571,7 +1191,7 @@ function applyOrientation() {
         c.style.top = '0';
     }
     
-    c.style.transform = t || 'none';
+    c.style.transform = ORIENTATION_TRANSFORMS[(portrait ? 4 : 0) | (flipH ? 2 : 0) | (flipV ? 1 : 0)];
 }
 
 // Reapply orientation on window resize
@@ -582,7 +1202,7 @@ function getUrl(item) {
         return `${LOCAL_CACHE_URL}/content/${item.filename}`;
     }
     if (item.remote_url) return item.remote_url;
-    return serverUrl + item.url;
+    return contentPrefix ? contentPrefix + item.filename : serverUrl + item.url;
 }
 
 // ============================================================
@@ -590,6 +1210,16 @@ function getUrl(item) {
 // Takes multiple samples, filters outliers, uses median
 // ============================================================
 
+// Local clock in epoch ms, driven by performance.now() so it never steps
+// when the OS clock is corrected (NTP) mid-playback. It reads as wall time
+// at page load; any slow drift from the wall clock is absorbed by the
+// periodic offset resync.
+const CLOCK_ORIGIN = performance.timeOrigin || (Date.now() - performance.now());
+
+function localClock() {
+    return CLOCK_ORIGIN + performance.now();
+}
+
 async function performTimeSync() {
     log('Performing robust time sync...');
     const samples = [];
@@ -597,14 +1227,14 @@ async function performTimeSync() {
     
     for (let i = 0; i < NUM_SAMPLES; i++) {
         try {
-            const t1 = Date.now();
+            const t1 = localClock();
             
             const response = await fetch(serverUrl + '/api/time', {
                 method: 'GET',
                 cache: 'no-store'
             });
             
-            const t4 = Date.now();
+            const t4 = localClock();
             const data = await response.json();
             const serverTimeMs = data.time * 1000;  // Convert to ms for precision
             
@@ -655,27 +1285,50 @@ async function performTimeSync() {
 // Get current time for sync calculations
 // Use LOCAL time adjusted by server offset for accuracy
 function getServerTime() {
-    return (Date.now() / 1000) + serverTimeOffset;
+    return localClock() / 1000 + serverTimeOffset;
+}
+
+// Periodic jobs run as setTimeout chains aimed at fixed slots (on the
+// performance.now() clock) rather than setInterval, so they keep their
+// cadence without queueing up runs after the page was busy or throttled.
+// Returns the first slot after `target` that is still in the future.
+function nextSlot(target, period) {
+    const now = performance.now();
+    target += period;
+    if (target <= now) target += (Math.floor((now - target) / period) + 1) * period;
+    return target;
 }
 
 // Start periodic time sync to maintain accuracy
-let timeSyncInterval = null;
+const TIME_SYNC_PERIOD = 30000;  // Check every 30 seconds
+let timeSyncTimer = null;
+let timeSyncGen = 0;   // Bumped on stop so a sync still in flight doesn't reschedule
+
 function startTimeSyncLoop() {
-    if (timeSyncInterval) clearInterval(timeSyncInterval);
-    timeSyncInterval = setInterval(async () => {
+    stopTimeSyncLoop();
+    scheduleTimeSync(performance.now() + TIME_SYNC_PERIOD, timeSyncGen);
+}
+
+function scheduleTimeSync(target, gen) {
+    timeSyncTimer = setTimeout(async () => {
+        timeSyncTimer = null;
         const newOffset = await performTimeSync();
+        if (gen !== timeSyncGen) return;
         const drift = Math.abs(newOffset - serverTimeOffset);
         if (drift > 0.05) {  // Only update if drift > 50ms
             log(`Offset drift detected: ${(drift*1000).toFixed(0)}ms - updating from ${(serverTimeOffset*1000).toFixed(0)}ms to ${(newOffset*1000).toFixed(0)}ms`);
             serverTimeOffset = newOffset;
         }
-    }, 30000);  // Check every 30 seconds
+        // A sync takes a second or more; the next one still starts on its slot
+        scheduleTimeSync(nextSlot(target, TIME_SYNC_PERIOD), gen);
+    }, Math.max(0, target - performance.now()));
 }
 
 function stopTimeSyncLoop() {
-    if (timeSyncInterval) {
-        clearInterval(timeSyncInterval);
-        timeSyncInterval = null;
+    timeSyncGen++;
+    if (timeSyncTimer) {
+        clearTimeout(timeSyncTimer);
+        timeSyncTimer = null;
     }
 }
 
@@ -684,16 +1337,23 @@ function stopTimeSyncLoop() {
 // ============================================================
 
 // Calculate when each item starts within the playlist cycle
+// Item end times in one flat (ascending) array, parallel to playlist - an
+// item starts where the previous one ends. Kept out of the item objects so
+// their shape stays as the server sent them.
+let itemEnds = new Float64Array(0);
+let itemEndsFor = null;
+
 function calculateItemStartTimes() {
     let cumulative = 0;
-    playlist.forEach((item, i) => {
-        item._startTime = cumulative;
+    itemEnds = new Float64Array(playlist.length);
+    for (let i = 0; i < playlist.length; i++) {
+        const item = playlist[i];
         const duration = getItemDuration(item);
-        item._duration = duration;
+        log(`Item ${i}: "${item.name}" ${cumulative.toFixed(1)}s-${(cumulative + duration).toFixed(1)}s (${duration}s)`);
         cumulative += duration;
-        item._endTime = cumulative;
-        log(`Item ${i}: "${item.name}" ${item._startTime.toFixed(1)}s-${item._endTime.toFixed(1)}s (${duration}s)`);
-    });
+        itemEnds[i] = cumulative;
+    }
+    itemEndsFor = playlist;
 }
 
 // Get effective duration of a playlist item
@@ -704,28 +1364,37 @@ function getItemDuration(item) {
     return item.display_duration || 10;
 }
 
-// Get current position within the playlist cycle
-function getCurrentCyclePosition() {
-    const now = getServerTime();
+// Get current position within the playlist cycle (or at server time `now`)
+function getCurrentCyclePosition(now = getServerTime()) {
     const elapsed = now - syncStartTime;
     const position = elapsed % totalCycleDuration;
     // Handle edge case where position might be negative due to timing
     return position < 0 ? position + totalCycleDuration : position;
 }
 
+// Index of the item after i, wrapping to the start (a compare instead of a
+// modulo, since it runs on every transition)
+function nextIndexAfter(i) {
+    return ++i === playlist.length ? 0 : i;
+}
+
 // Find which item should be playing at a given position
 function getItemAtPosition(position) {
-    for (let i = 0; i < playlist.length; i++) {
-        if (position >= playlist[i]._startTime && position < playlist[i]._endTime) {
-            return { 
-                index: i, 
-                elapsed: position - playlist[i]._startTime,
-                remaining: playlist[i]._endTime - position
-            };
-        }
+    if (itemEndsFor !== playlist) calculateItemStartTimes();
+    // First item ending after position (lower bound over end times)
+    const ends = itemEnds;
+    let lo = 0, hi = ends.length;
+    while (lo < hi) {
+        const mid = (lo + hi) >>> 1;
+        if (ends[mid] <= position) lo = mid + 1;
+        else hi = mid;
+    }
+    if (lo < ends.length && position >= 0) {
+        const start = lo ? ends[lo - 1] : 0;
+        return { index: lo, elapsed: position - start, remaining: ends[lo] - position };
     }
     // Default to first item if position doesn't match any (shouldn't happen)
-    return { index: 0, elapsed: 0, remaining: playlist[0]?._duration || 10 };
+    return { index: 0, elapsed: 0, remaining: ends.length ? ends[0] : 10 };
 }
 
 // ============================================================
@@ -740,6 +1409,9 @@ async function init() {
             serverUrlInput.value = c.server_url;
             serverUrl = c.server_url;
         }
+        contentPrefix = c.content_prefix || '';
+        wsUrl = c.ws_url || '';
+        pyDebug = !!c.debug;
         if (c.is_connected) {
             deviceNameDisplay.textContent = c.device_name || 'Device';
             connectPanel.classList.add('hidden');
@@ -765,6 +1437,8 @@ async function connect() {
         const r = await pywebview.api.register(url, code);
         if (r.success) {
             serverUrl = url;
+            contentPrefix = r.content_prefix || '';
+            wsUrl = r.ws_url || '';
             deviceNameDisplay.textContent = r.device_name || 'Device';
             connectPanel.classList.add('hidden');
             connectedPanel.classList.remove('hidden');
@@ -795,20 +1469,33 @@ async function disconnect() {
 async function startPlayback() {
     log('Starting playback...');
     setupScreen.classList.add('hidden');
-    await syncAndPlay();
+    await syncAndPlay(true);
     startPolling();
+    openPushChannel();
 }
 
-async function syncAndPlay() {
+// Splash config fetched together with the first playlist, used by
+// showSplash if that playlist turns out to be empty
+let bootDisplay = null;
+
+async function syncAndPlay(boot = false) {
     log('Fetching playlist with sync info...');
     updateSyncIndicator('syncing', 'Syncing...');
     
     try {
-        // Perform time sync and set the offset
-        serverTimeOffset = await performTimeSync();
-        log(`Time offset set to: ${(serverTimeOffset*1000).toFixed(0)}ms`);
-        
-        const r = await pywebview.api.get_playlist();
+        let r;
+        if (boot) {
+            // Measure the clock offset while the playlist is being fetched
+            // rather than before it. Later playlist changes reuse the offset
+            // that the time sync loop keeps current.
+            const [offset, state] = await Promise.all([performTimeSync(), pywebview.api.get_boot_state()]);
+            serverTimeOffset = offset;
+            log(`Time offset set to: ${(serverTimeOffset*1000).toFixed(0)}ms`);
+            r = state.playlist;
+            bootDisplay = state.default_display;
+        } else {
+            r = await pywebview.api.get_playlist();
+        }
         
         if (!r.success) {
             log('Playlist fetch failed');
@@ -817,6 +1504,7 @@ async function syncAndPlay() {
         }
         
         playlist = r.playlist || [];
+        playlistVersion = playlistVersionOf(r);
         serverUrl = r.server_url || serverUrl;
         orientation = r.orientation || 'landscape';
         flipH = r.flip_horizontal || false;
@@ -832,7 +1520,7 @@ async function syncAndPlay() {
             syncStartTime = r.sync.start_time || 0;
             totalCycleDuration = r.sync.total_duration || 0;
             log(`Sync info: syncStartTime=${syncStartTime.toFixed(3)}, cycle=${totalCycleDuration.toFixed(1)}s`);
-            log(`Local time: ${(Date.now()/1000).toFixed(3)}, elapsed since sync: ${((Date.now()/1000) - syncStartTime).toFixed(1)}s`);
+            log(`Local time: ${(localClock()/1000).toFixed(3)}, elapsed since sync: ${(localClock()/1000 - syncStartTime).toFixed(1)}s`);
         }
         
         applyOrientation();
@@ -848,7 +1536,7 @@ async function syncAndPlay() {
             log('No sync info - falling back to sequential playback');
             // Calculate duration manually
             totalCycleDuration = playlist.reduce((sum, item) => sum + getItemDuration(item), 0);
-            syncStartTime = Date.now() / 1000;
+            syncStartTime = localClock() / 1000;
             calculateItemStartTimes();
             await startSyncedPlayback();
         } else {
@@ -858,6 +1546,7 @@ async function syncAndPlay() {
         log('Sync error: ' + e.message);
         showSplash();
     }
+    bootDisplay = null;
 }
 
 async function startSyncedPlayback() {
@@ -880,26 +1569,74 @@ async function startSyncedPlayback() {
     
     // Preload current and next items
     await preload(currentIndex, 0);
-    const nextIndex = (currentIndex + 1) % playlist.length;
-    preload(nextIndex, 1);
+    const nextIndex = nextIndexAfter(currentIndex);
+    ensurePreloaded(nextIndex, 1);
     
-    // Show current item, seeking if needed
+    // Show current item, seeking if needed (also starts sync monitoring)
     showSyncedItem(elapsed);
-    
-    // Start sync monitoring
-    startSyncLoop();
 }
 
-async function preload(idx, layer) {
-    if (idx >= playlist.length) return;
+// The <video> element on each content layer (null when it shows an image),
+// set by preload() so sync checks don't search the layer every tick
+const layerVideos = [null, null];
+// Resolves the pending preload() promise on each layer, if any
+const layerPreloads = [null, null];
+// The playlist item each layer holds (or is loading), and the scale mode
+// and URL it was loaded with ('' when the layer is empty or failed)
+const layerItems = [null, null];
+const layerSources = ['', ''];
+const PRELOADED = Promise.resolve();
+
+// Stop whatever a layer is showing or still loading. A detached video keeps
+// downloading until its source is dropped and the element reset.
+function releaseLayer(layer) {
+    const v = layerVideos[layer];
+    if (v) {
+        v.onerror = null;
+        v.pause();
+        v.removeAttribute('src');
+        v.load();
+        layerVideos[layer] = null;
+    }
+    const done = layerPreloads[layer];
+    layerPreloads[layer] = null;
+    if (done) done();
+    layerItems[layer] = null;
+    layerSources[layer] = '';
+    contentLayers[layer].innerHTML = '';
+}
+
+// Preload an item unless the layer already holds it
+function ensurePreloaded(idx, layer) {
+    if (layerItems[layer] !== playlist[idx]) return preload(idx, layer);
+}
+
+function preload(idx, layer) {
+    if (idx >= playlist.length) return PRELOADED;
     const item = playlist[idx];
     const url = getUrl(item);
     const el = contentLayers[layer];
     const scaleMode = item.scale_mode || 'fit';
+    const source = scaleMode + ' ' + url;
+    
+    // The layer already shows this media (a two-item loop, or an unchanged
+    // item after a playlist refresh) - keep the loaded element
+    if (layerSources[layer] === source && !layerPreloads[layer]) {
+        layerItems[layer] = item;
+        return PRELOADED;
+    }
     
-    el.innerHTML = '';
+    releaseLayer(layer);
+    layerItems[layer] = item;
+    layerSources[layer] = source;
+    const failed = () => { if (layerSources[layer] === source) layerSources[layer] = ''; };
     
     return new Promise(resolve => {
+        const done = () => {
+            if (layerPreloads[layer] === done) layerPreloads[layer] = null;
+            resolve();
+        };
+        layerPreloads[layer] = done;
         if (item.file_type === 'video') {
             const v = document.createElement('video');
             v.src = url;
@@ -907,15 +1644,18 @@ async function preload(idx, layer) {
             v.playsInline = true;
             v.muted = false;
             v.className = 'scale-' + scaleMode;
-            v.onloadeddata = () => resolve();
-            v.onerror = () => { log('Video load error: ' + url); resolve(); };
+            // Wait until it can play to the end without stalling, so the
+            // first play() after showing it starts straight away
+            v.oncanplaythrough = () => { v.oncanplaythrough = null; done(); };
+            v.onerror = () => { log('Video load error: ' + url); failed(); done(); };
             el.appendChild(v);
+            layerVideos[layer] = v;
         } else {
             const img = document.createElement('img');
             img.src = url;
             img.className = 'scale-' + scaleMode;
-            img.onload = () => resolve();
-            img.onerror = () => { log('Image load error: ' + url); resolve(); };
+            img.onload = () => done();
+            img.onerror = () => { log('Image load error: ' + url); failed(); done(); };
             el.appendChild(img);
         }
     });
@@ -977,22 +1717,24 @@ function updateBackground(item) {
     }
 }
 
+// Show one content layer and hide the other. The layers keep a fixed
+// stacking order (layer 1 above layer 0) and only their opacity changes,
+// which the compositor handles without restacking
+function showLayer(layer) {
+    contentLayers[layer].classList.add('active');
+    contentLayers[1 - layer].classList.remove('active');
+}
+
 function showSyncedItem(elapsedInItem) {
-    const currentLayer = contentLayers[activeLayer];
-    const otherLayer = contentLayers[1 - activeLayer];
-    
     // Show current layer
-    currentLayer.style.zIndex = '2';
-    currentLayer.classList.add('active');
-    otherLayer.style.zIndex = '1';
-    otherLayer.classList.remove('active');
+    showLayer(activeLayer);
     
     const item = playlist[currentIndex];
     
     // Update background for current item
     updateBackground(item);
     
-    const video = currentLayer.querySelector('video');
+    const video = layerVideos[activeLayer];
     
     if (video && item.file_type === 'video') {
         // Seek video to correct position and play
@@ -1009,61 +1751,137 @@ function showSyncedItem(elapsedInItem) {
     }
     
     scheduleNextTransition();
+    startSyncLoop();
+    preloadUpcoming();
 }
 
-// Use a single requestAnimationFrame loop for precise timing
+// Fetch and decode upcoming images ahead of their transitions. The Image
+// objects are kept (least recently used dropped first) so the decoded
+// bitmaps stay in the browser's memory cache; on short playlists every
+// image stays warm and is never fetched twice. Videos are left to the
+// hidden layer, which already buffers the next item.
+const PRELOAD_AHEAD = 2;
+const PRELOAD_CACHE_SIZE = 8;
+const preloadCache = new Map();  // url -> Image, oldest first
+
+function preloadUpcoming() {
+    const ahead = Math.min(PRELOAD_AHEAD, playlist.length - 1);
+    let idx = currentIndex;
+    for (let step = 1; step <= ahead; step++) {
+        idx = nextIndexAfter(idx);
+        const item = playlist[idx];
+        if (item.file_type === 'video') continue;
+        const url = getUrl(item);
+        let img = preloadCache.get(url);
+        if (img) {
+            preloadCache.delete(url);  // Re-insert as most recently used
+        } else {
+            img = new Image();
+            img.decoding = 'async';
+            img.src = url;
+            img.decode().catch(() => {});
+        }
+        preloadCache.set(url, img);
+        if (preloadCache.size > PRELOAD_CACHE_SIZE) {
+            preloadCache.delete(preloadCache.keys().next().value);
+        }
+    }
+}
+
+// Transitions wait on a timer until just before the target, then check
+// every frame so the swap lands on the right vsync (no per-frame wakeups
+// for the rest of the item)
+const TRANSITION_RAF_LEAD = 0.032;  // Seconds of per-frame checks before the target
 let transitionTargetTime = 0;
+// Seconds between firing a transition and its first frame reaching the
+// screen. Transitions fire this much before the boundary so the swap is
+// seen on time; re-measured after every transition (EWMA).
+let transitionLatency = 0.016;
+// The boundary the last transition was fired for (it may not have passed yet)
+let lastTransitionBoundary = 0;
+// Server times are ~1.7e9s, so the cycle position of a boundary can round
+// to just before the outgoing item's end - look items up this far past it
+const BOUNDARY_NUDGE = 0.001;
+// Set from firing a transition until its swap is done; sync checks wait
+let transitionInProgress = false;
+// Longest a transition waits for an item that was not preloaded (ms). A
+// video that is still buffering is shown anyway and catches up as it plays.
+const TRANSITION_LOAD_WAIT = 1500;
 let rafId = null;
+// The transition's firing time on the performance.now() clock, in ms -
+// computed when the frame checks start so each frame only compares two
+// numbers
+let transitionFrameTarget = 0;
+
+function armTransition() {
+    stopTransitionLoop();
+    const delay = (transitionTargetTime - transitionLatency - getServerTime() - TRANSITION_RAF_LEAD) * 1000;
+    if (delay > 0) {
+        playbackTimer = setTimeout(() => {
+            playbackTimer = null;
+            startTransitionFrames();
+        }, delay);
+    } else {
+        startTransitionFrames();
+    }
+}
+
+function startTransitionFrames() {
+    const fireAt = (transitionTargetTime - transitionLatency - serverTimeOffset) * 1000;
+    transitionFrameTarget = fireAt - CLOCK_ORIGIN;
+    rafId = requestAnimationFrame(transitionLoop);
+}
 
 function scheduleNextTransition() {
-    const item = playlist[currentIndex];
     const now = getServerTime();
     
     // Calculate elapsed time since sync started
     const elapsed = now - syncStartTime;
     
-    // Calculate current position within the cycle
-    const cyclePosition = elapsed % totalCycleDuration;
-    
     // Calculate the current cycle number
     const cycleNumber = Math.floor(elapsed / totalCycleDuration);
     
     // Calculate when this cycle started
     const cycleStartTime = syncStartTime + (cycleNumber * totalCycleDuration);
     
-    // The item ends at cycleStartTime + item._endTime
-    let targetTime = cycleStartTime + item._endTime;
+    // The item ends at cycleStartTime + its end time in the cycle
+    let targetTime = cycleStartTime + itemEnds[currentIndex];
     
     // If we're past this item's end time in the current cycle,
     // we need to target the NEXT cycle's occurrence
     if (targetTime <= now) {
         targetTime += totalCycleDuration;
-        log(`Cycle boundary: targeting next cycle`);
+        dlog('Cycle boundary: targeting next cycle');
     }
     
     transitionTargetTime = targetTime;
     
     const timeUntilTransition = transitionTargetTime - now;
     
-    log(`Item ${currentIndex} ends at ${item._endTime.toFixed(1)}s in cycle. Target: ${transitionTargetTime.toFixed(3)}, in ${(timeUntilTransition*1000).toFixed(0)}ms`);
+    if (verbose()) log(`Item ${currentIndex} ends at ${itemEnds[currentIndex].toFixed(1)}s in cycle. Target: ${transitionTargetTime.toFixed(3)}, in ${(timeUntilTransition*1000).toFixed(0)}ms`);
     
-    // Start the animation frame loop if not already running
-    if (!rafId) {
-        rafId = requestAnimationFrame(transitionLoop);
-    }
+    // Load the next item into the hidden layer now, with the whole item's
+    // duration as headroom - including across the wrap to item 0
+    ensurePreloaded(nextIndexAfter(currentIndex), 1 - activeLayer);
+    
+    armTransition();
 }
 
 function transitionLoop(timestamp) {
-    const now = getServerTime();
-    const remaining = transitionTargetTime - now;
+    // Frame start time; a stale timestamp (seen after long frames in some
+    // Chromium builds) falls back to the current time
+    const perfNow = performance.now();
+    const frameTime = perfNow - timestamp > 10 ? perfNow : timestamp;
     
-    if (remaining <= 0.008) {  // Within 8ms (half a frame) - fire now
+    if (transitionFrameTarget - frameTime <= 8) {  // Within 8ms (half a frame) - fire now
         rafId = null;
-        const localNow = Date.now();
-        const adjustedNow = getServerTime();
-        const drift = (adjustedNow - transitionTargetTime) * 1000;
-        log(`>>> FIRED: local=${localNow}, adjusted=${adjustedNow.toFixed(3)}, target=${transitionTargetTime.toFixed(3)}, drift=${drift.toFixed(0)}ms, offset=${(serverTimeOffset*1000).toFixed(0)}ms`);
-        doSyncedTransition();
+        if (verbose()) {
+            const localNow = Date.now();
+            const adjustedNow = getServerTime();
+            const drift = (adjustedNow - transitionTargetTime) * 1000;
+            log(`>>> FIRED: local=${localNow}, adjusted=${adjustedNow.toFixed(3)}, target=${transitionTargetTime.toFixed(3)}, drift=${drift.toFixed(0)}ms, lead=${(transitionLatency*1000).toFixed(0)}ms, offset=${(serverTimeOffset*1000).toFixed(0)}ms`);
+        }
+        doSyncedTransition(frameTime);
     } else {
         // Keep looping
         rafId = requestAnimationFrame(transitionLoop);
@@ -1073,14 +1891,13 @@ function transitionLoop(timestamp) {
 // Alternative approach: fire transitions at fixed time boundaries
 // This ensures both devices execute at the same "wall clock moment"
 function scheduleAlignedTransition() {
-    const item = playlist[currentIndex];
     const now = getServerTime();
     
     // Calculate when this item should end
     const elapsed = now - syncStartTime;
     const cycleNumber = Math.floor(elapsed / totalCycleDuration);
     const cycleStartTime = syncStartTime + (cycleNumber * totalCycleDuration);
-    let targetTime = cycleStartTime + item._endTime;
+    let targetTime = cycleStartTime + itemEnds[currentIndex];
     
     if (targetTime <= now) {
         targetTime += totalCycleDuration;
@@ -1095,41 +1912,74 @@ function scheduleAlignedTransition() {
     const timeUntilTransition = transitionTargetTime - now;
     log(`Aligned target: ${transitionTargetTime.toFixed(3)}, in ${(timeUntilTransition*1000).toFixed(0)}ms`);
     
-    if (!rafId) {
-        rafId = requestAnimationFrame(transitionLoop);
-    }
+    armTransition();
 }
 
 function stopTransitionLoop() {
+    if (playbackTimer) {
+        clearTimeout(playbackTimer);
+        playbackTimer = null;
+    }
     if (rafId) {
         cancelAnimationFrame(rafId);
         rafId = null;
     }
 }
 
-async function doSyncedTransition() {
+// Measure how long the swap made during the frame starting at frameTime
+// takes to be presented: the next frame starts once it is on screen
+function measureTransitionLatency(frameTime) {
+    requestAnimationFrame(ts => {
+        const latency = Math.min(Math.max((ts - frameTime) / 1000, 0), 0.1);
+        transitionLatency += (latency - transitionLatency) * 0.25;
+    });
+}
+
+async function doSyncedTransition(frameTime = performance.now()) {
     stopTransitionLoop();
     
-    // Calculate what should be playing NOW
-    const position = getCurrentCyclePosition();
-    const { index, elapsed } = getItemAtPosition(position);
+    // Calculate what should be playing at the boundary - the transition
+    // fires up to transitionLatency early, before the server clock gets there
+    lastTransitionBoundary = transitionTargetTime;
+    const now = getServerTime();
+    // A scheduled fire moves on to the next item; only one that is a whole
+    // item late (e.g. after a suspend) needs to look up the schedule
+    const next = nextIndexAfter(currentIndex);
+    const late = Math.max(0, now - lastTransitionBoundary);
+    let index = next, elapsed = late;
+    if (next >= playlist.length || late >= getItemDuration(playlist[next])) {
+        const position = getCurrentCyclePosition(Math.max(now, lastTransitionBoundary + BOUNDARY_NUDGE));
+        ({ index, elapsed } = getItemAtPosition(position));
+    }
     
     currentIndex = index;
     const nextLayer = 1 - activeLayer;
     
-    const newLayer = contentLayers[nextLayer];
-    const oldLayer = contentLayers[activeLayer];
+    // The hidden layer normally holds this item already (see
+    // scheduleNextTransition); only load it now if something changed
+    if (layerItems[nextLayer] !== playlist[index]) {
+        log(`Item ${index} not preloaded - loading before swap`);
+        const started = performance.now();
+        transitionInProgress = true;
+        try {
+            await Promise.race([
+                preload(index, nextLayer),
+                new Promise(resolve => setTimeout(resolve, TRANSITION_LOAD_WAIT)),
+            ]);
+        } finally {
+            transitionInProgress = false;
+        }
+        elapsed += (performance.now() - started) / 1000;
+    }
     
     // IMMEDIATELY perform the visual transition - synchronous, no RAF wrapper
-    newLayer.style.zIndex = '2';
-    newLayer.classList.add('active');
-    oldLayer.style.zIndex = '1';
-    oldLayer.classList.remove('active');
+    showLayer(nextLayer);
     
-    log(`Visual swap done at ${Date.now()}`);
+    if (verbose()) log(`Visual swap done at ${Date.now()}`);
+    measureTransitionLatency(frameTime);
     
     // Stop current video
-    const video = oldLayer.querySelector('video');
+    const video = layerVideos[activeLayer];
     if (video) {
         video.pause();
         video.onended = null;
@@ -1142,33 +1992,62 @@ async function doSyncedTransition() {
     updateSyncIndicator('synced', `Item ${currentIndex+1}/${playlist.length}`);
     
     // Handle video seeking if needed
-    const newVideo = newLayer.querySelector('video');
+    const newVideo = layerVideos[nextLayer];
     if (newVideo && playlist[currentIndex]?.file_type === 'video') {
         newVideo.currentTime = elapsed;
         newVideo.play().catch(e => log('Video play error: ' + e.message));
     }
     
-    // Preload next item in background
-    const preloadIndex = (currentIndex + 1) % playlist.length;
-    preload(preloadIndex, 1 - activeLayer);
-    
-    // Schedule next transition
+    // Schedule next transition (which preloads the next item)
     scheduleNextTransition();
+    startSyncLoop();
+    preloadUpcoming();
 }
 
 // ============================================================
 // SYNC MONITORING & CORRECTION
 // ============================================================
 
+// Videos are checked every second for media clock drift. Images have no
+// clock of their own - the scheduled transition moves past them - so they
+// only get a slow safety check against server time drift.
+const SYNC_CHECK_VIDEO = 1000;
+const SYNC_CHECK_IMAGE = 10000;
+let syncCheckPeriod = 0;
+
 function startSyncLoop() {
-    if (syncCheckInterval) clearInterval(syncCheckInterval);
+    const period = playlist[currentIndex]?.file_type === 'video' ? SYNC_CHECK_VIDEO : SYNC_CHECK_IMAGE;
+    if (syncCheckTimer && period === syncCheckPeriod) return;
+    stopSyncLoop();
     
-    // Check sync every second for tighter accuracy
-    syncCheckInterval = setInterval(() => checkAndCorrectSync(), 1000);
+    syncCheckPeriod = period;
+    scheduleSyncCheck(performance.now() + period);
+}
+
+function scheduleSyncCheck(target) {
+    syncCheckTimer = setTimeout(() => {
+        // Queue the next check first; a correction may restart the loop
+        scheduleSyncCheck(nextSlot(target, syncCheckPeriod));
+        checkAndCorrectSync();
+    }, Math.max(0, target - performance.now()));
+}
+
+function stopSyncLoop() {
+    if (syncCheckTimer) {
+        clearTimeout(syncCheckTimer);
+        syncCheckTimer = null;
+    }
 }
 
 function checkAndCorrectSync() {
-    const position = getCurrentCyclePosition();
+    // The transition loop owns item boundaries: leave it alone while a
+    // transition is due (unless it is over a second late), and judge a
+    // transition that fired early against the boundary it fired for
+    if (transitionInProgress) return;
+    const now = getServerTime();
+    const due = transitionTargetTime - transitionLatency - TRANSITION_RAF_LEAD;
+    if (now >= due && now < transitionTargetTime + 1) return;
+    const position = getCurrentCyclePosition(Math.max(now, lastTransitionBoundary + BOUNDARY_NUDGE));
     const { index, elapsed } = getItemAtPosition(position);
     
     // Check if we're on the wrong item
@@ -1179,25 +2058,37 @@ function checkAndCorrectSync() {
     }
     
     // Check video timing drift - tighter threshold of 50ms
-    const currentLayer = contentLayers[activeLayer];
-    const video = currentLayer.querySelector('video');
+    const video = layerVideos[activeLayer];
     if (video && playlist[currentIndex]?.file_type === 'video') {
-        const drift = Math.abs(video.currentTime - elapsed);
-        if (drift > 0.05) {  // More than 50ms drift
-            log(`VIDEO DRIFT: ${(drift*1000).toFixed(0)}ms - correcting`);
-            video.currentTime = elapsed;
+        if (video.requestVideoFrameCallback) {
+            // Compare the next frame presented with where the item should
+            // be when that frame is on screen (currentTime may report the
+            // last decoded frame rather than the one shown)
+            const idx = currentIndex;
+            video.requestVideoFrameCallback((frameNow, meta) => {
+                if (idx !== currentIndex || video !== layerVideos[activeLayer]) return;
+                const shownAt = (CLOCK_ORIGIN + meta.expectedDisplayTime) / 1000 + serverTimeOffset;
+                const expected = getItemAtPosition(getCurrentCyclePosition(shownAt)).elapsed;
+                correctVideoDrift(video, meta.mediaTime - expected);
+            });
+        } else {
+            correctVideoDrift(video, video.currentTime - elapsed);
         }
     }
 }
 
+function correctVideoDrift(video, drift) {
+    if (Math.abs(drift) > 0.05) {  // More than 50ms drift
+        log(`VIDEO DRIFT: ${(Math.abs(drift)*1000).toFixed(0)}ms - correcting`);
+        video.currentTime = getItemAtPosition(getCurrentCyclePosition()).elapsed;
+    }
+}
+
 async function resync() {
     log('Resyncing...');
     updateSyncIndicator('syncing', 'Resyncing...');
     
-    if (playbackTimer) {
-        clearTimeout(playbackTimer);
-        playbackTimer = null;
-    }
+    stopTransitionLoop();
     
     // Recalibrate time before resync
     serverTimeOffset = await performTimeSync();
@@ -1210,8 +2101,8 @@ async function resync() {
     showSyncedItem(elapsed);
     
     // Preload next
-    const nextIndex = (currentIndex + 1) % playlist.length;
-    preload(nextIndex, 1 - activeLayer);
+    const nextIndex = nextIndexAfter(currentIndex);
+    ensurePreloaded(nextIndex, 1 - activeLayer);
     
     updateSyncIndicator('synced', `Item ${currentIndex+1}/${playlist.length}`);
 }
@@ -1220,117 +2111,292 @@ async function resync() {
 // POLLING FOR UPDATES
 // ============================================================
 
+// Polls back off (doubling from POLL_MIN_INTERVAL up to POLL_MAX_INTERVAL)
+// while nothing changes and drop back to the minimum as soon as something
+// does. With the push channel open, polling only has to catch schedule
+// windows opening/closing, so it stays at the maximum.
+let pollingActive = false;
+let unchangedPolls = 0;
+
+function nextPollDelay() {
+    const base = pushConnected() ? POLL_MAX_INTERVAL :
+        Math.min(POLL_MAX_INTERVAL, POLL_MIN_INTERVAL * 2 ** unchangedPolls);
+    // +/-10% jitter so a room full of players doesn't poll in lockstep
+    return base * (0.9 + Math.random() * 0.2);
+}
+
+// Idempotent: a second call while polling is running (e.g. startPlayback
+// reached twice during startup) keeps the single existing poll stream
 function startPolling() {
-    if (pollTimer) clearInterval(pollTimer);
+    if (pollingActive && pollTimer) return;
+    pollingActive = true;
+    unchangedPolls = 0;
+    // The playlist was just fetched; start the poll stream at a random
+    // offset so players started together (after a power cut, say) don't
+    // keep hitting the server at the same moment
+    schedulePoll(Math.random() * POLL_START_SPREAD);
+}
+
+function schedulePoll(delay = nextPollDelay()) {
+    if (pollTimer) clearTimeout(pollTimer);
+    pollTimer = setTimeout(pollTick, delay);
+}
+
+async function pollTick() {
+    pollTimer = null;
+    const started = performance.now();
+    await pollOnce();
+    // Measure the next delay from when this poll started, so a slow reply
+    // doesn't stretch the cadence
+    if (pollingActive && !pollTimer) schedulePoll(Math.max(0, started + nextPollDelay() - performance.now()));
+}
+
+// Runs one check; a request while one is in flight (e.g. a server push)
+// re-runs it afterwards instead of overlapping
+let pollBusy = false, pollAgain = false;
+let pollGen = 0;   // Bumped by stopPolling() so replies to earlier requests are dropped
+
+async function pollOnce() {
+    if (pollBusy) { pollAgain = true; return; }
+    pollBusy = true;
+    let changed = false;
+    try {
+        changed = await checkForUpdates();
+    } catch (e) {
+        console.error('Poll error', e);
+    } finally {
+        pollBusy = false;
+    }
+    unchangedPolls = changed ? 0 : unchangedPolls + 1;
+    if (pollAgain) { pollAgain = false; await pollOnce(); }
+}
+
+// Applies any server-side changes; resolves to whether anything changed
+async function checkForUpdates() {
+    const gen = pollGen;
+    const r = await pywebview.api.get_playlist();
+    if (!r.success || r.unchanged) return false;
+    if (gen !== pollGen) {
+        // Dropped, but Python has already cached it - make the next poll
+        // fetch it in full rather than get a 304 for it
+        pywebview.api.forget_playlist_etag();
+        return false;
+    }
     
-    pollTimer = setInterval(async () => {
-        try {
-            const r = await pywebview.api.get_playlist();
-            if (!r.success) return;
-            
-            // Check if sync time changed (content was modified on server)
-            if (r.sync && r.sync.start_time !== syncStartTime) {
-                log('Server sync time changed - full resync');
-                syncStartTime = r.sync.start_time;
-                totalCycleDuration = r.sync.total_duration;
-                // Don't overwrite serverTimeOffset - it's managed by the time sync loop
-                
-                playlist = r.playlist || [];
-                calculateItemStartTimes();
-                await resync();
-                return;
-            }
-            
-            // Check for playlist changes (items added/removed)
-            const newIds = (r.playlist || []).map(i => i.id).join(',');
-            const oldIds = playlist.map(i => i.id).join(',');
-            if (newIds !== oldIds) {
-                log('Playlist items changed - full resync');
-                await syncAndPlay();
-                return;
-            }
-            
-            // Check for content property changes (scale_mode, duration, etc.)
-            const newPlaylist = r.playlist || [];
-            let contentChanged = false;
-            for (let i = 0; i < newPlaylist.length; i++) {
-                const newItem = newPlaylist[i];
-                const oldItem = playlist.find(p => p.id === newItem.id);
-                if (oldItem) {
-                    if (oldItem.scale_mode !== newItem.scale_mode ||
-                        oldItem.display_duration !== newItem.display_duration ||
-                        oldItem.is_active !== newItem.is_active) {
-                        contentChanged = true;
-                        log(`Content item ${newItem.id} changed: scale=${newItem.scale_mode}, duration=${newItem.display_duration}`);
-                        break;
-                    }
-                }
-            }
-            
-            if (contentChanged) {
-                log('Content properties changed - updating playlist');
-                playlist = newPlaylist;
-                totalCycleDuration = r.sync?.total_duration || totalCycleDuration;
-                calculateItemStartTimes();
-                // Re-preload current item with new settings
-                await preload(currentIndex, activeLayer);
-                // Update background in case scale_mode changed to/from blur
-                updateBackground(playlist[currentIndex]);
-                // Reapply current item display
-                const pos = getCurrentCyclePosition();
-                const { elapsed } = getItemAtPosition(pos);
-                showSyncedItem(elapsed);
-            }
-            
-            // Update display settings if changed
-            if (r.orientation !== orientation || r.flip_horizontal !== flipH || r.flip_vertical !== flipV) {
-                orientation = r.orientation || 'landscape';
-                flipH = r.flip_horizontal || false;
-                flipV = r.flip_vertical || false;
-                applyOrientation();
-            }
-            
-            // Update background settings if changed
-            if (r.background_mode !== backgroundMode || r.background_color !== backgroundColor) {
-                backgroundMode = r.background_mode || 'solid';
-                backgroundColor = r.background_color || '#000000';
-                if (playlist.length > 0 && currentIndex < playlist.length) {
-                    updateBackground(playlist[currentIndex]);
-                }
+    // Check if sync time changed (content was modified on server)
+    if (r.sync && r.sync.start_time !== syncStartTime) {
+        log('Server sync time changed - full resync');
+        syncStartTime = r.sync.start_time;
+        totalCycleDuration = r.sync.total_duration;
+        // Don't overwrite serverTimeOffset - it's managed by the time sync loop
+        
+        playlist = r.playlist || [];
+        playlistVersion = playlistVersionOf(r);
+        calculateItemStartTimes();
+        await resync();
+        return true;
+    }
+    
+    // Check for playlist changes (items added/removed/reordered)
+    if (playlistVersionOf(r) !== playlistVersion) {
+        log('Playlist items changed - full resync');
+        await syncAndPlay();
+        return true;
+    }
+    
+    // Check for content property changes (scale_mode, duration, etc.).
+    // The version matched, so items are normally in the same order and can
+    // be paired by index; only search if an id doesn't line up.
+    const newPlaylist = r.playlist || [];
+    let contentChanged = false;
+    for (let i = 0; i < newPlaylist.length; i++) {
+        const newItem = newPlaylist[i];
+        const oldItem = playlist[i]?.id === newItem.id ? playlist[i] : playlist.find(p => p.id === newItem.id);
+        if (oldItem) {
+            if (oldItem.scale_mode !== newItem.scale_mode ||
+                oldItem.display_duration !== newItem.display_duration ||
+                oldItem.is_active !== newItem.is_active) {
+                contentChanged = true;
+                log(`Content item ${newItem.id} changed: scale=${newItem.scale_mode}, duration=${newItem.display_duration}`);
+                break;
             }
-        } catch (e) {
-            console.error('Poll error', e);
         }
-    }, 5000);  // Poll every 5 seconds for responsive updates
+    }
+    
+    if (contentChanged) {
+        log('Content properties changed - updating playlist');
+        playlist = newPlaylist;
+        totalCycleDuration = r.sync?.total_duration || totalCycleDuration;
+        calculateItemStartTimes();
+        // Re-preload current item with new settings
+        await preload(currentIndex, activeLayer);
+        // Update background in case scale_mode changed to/from blur
+        updateBackground(playlist[currentIndex]);
+        // Reapply current item display
+        const pos = getCurrentCyclePosition();
+        const { elapsed } = getItemAtPosition(pos);
+        showSyncedItem(elapsed);
+    }
+    
+    // Update display settings if changed
+    const orientationChanged = r.orientation !== orientation || r.flip_horizontal !== flipH || r.flip_vertical !== flipV;
+    if (orientationChanged) {
+        orientation = r.orientation || 'landscape';
+        flipH = r.flip_horizontal || false;
+        flipV = r.flip_vertical || false;
+        applyOrientation();
+    }
+    
+    // Update background settings if changed
+    const backgroundChanged = r.background_mode !== backgroundMode || r.background_color !== backgroundColor;
+    if (backgroundChanged) {
+        backgroundMode = r.background_mode || 'solid';
+        backgroundColor = r.background_color || '#000000';
+        if (playlist.length > 0 && currentIndex < playlist.length) {
+            updateBackground(playlist[currentIndex]);
+        }
+    }
+    
+    return contentChanged || orientationChanged || backgroundChanged;
 }
 
 function stopPolling() {
-    if (pollTimer) { clearInterval(pollTimer); pollTimer = null; }
+    pollingActive = false;
+    pollAgain = false;
+    pollGen++;
+    if (pollTimer) { clearTimeout(pollTimer); pollTimer = null; }
+}
+
+// Don't poll while the window is minimized or covered; catch up with one
+// immediate check when it becomes visible again
+let pollingPaused = false;
+
+document.addEventListener('visibilitychange', () => {
+    if (document.hidden) {
+        if (!pollingActive) return;
+        stopPolling();
+        pollingPaused = true;
+    } else if (pollingPaused) {
+        pollingPaused = false;
+        startPolling();
+        pollOnce();
+    }
+});
+
+// ============================================================
+// SERVER PUSH
+// ============================================================
+
+// The server notifies connected players over a WebSocket whenever content,
+// schedules or device settings change, so changes are picked up right away.
+// Polling continues at its slowest rate while it's open, to catch schedule
+// windows opening/closing (which nothing pushes) and as a fallback.
+const POLL_MIN_INTERVAL = 2000;
+const POLL_MAX_INTERVAL = 60000;
+const POLL_START_SPREAD = 30000;   // Window a fleet's first/catch-up polls are spread over
+const HEARTBEAT_INTERVAL = 60000;
+
+let wsUrl = '';
+let socket = null;
+let pushEnabled = false;
+let pushRetryDelay = 1000;
+let pushRetryTimer = null;
+let heartbeatTimer = null;
+
+function pushConnected() {
+    return socket !== null && socket.readyState === WebSocket.OPEN;
+}
+
+function openPushChannel() {
+    pushEnabled = true;
+    if (!wsUrl || socket) return;
+    try {
+        socket = new WebSocket(wsUrl);
+    } catch (e) {
+        log('Push channel unavailable: ' + e.message);
+        socket = null;
+        return;
+    }
+    socket.onopen = () => {
+        log('Push channel connected');
+        pushRetryDelay = 1000;
+        sendHeartbeat();
+        heartbeatTimer = setInterval(sendHeartbeat, HEARTBEAT_INTERVAL);
+        // Catch up on anything pushed while we were disconnected. Every player
+        // reconnects at once after a server restart, so spread these out
+        if (pollingActive) schedulePoll(Math.random() * POLL_START_SPREAD);
+    };
+    socket.onmessage = (event) => {
+        let msg;
+        try { msg = JSON.parse(event.data); } catch (e) { return; }
+        if (msg.type === 'heartbeat_ack') return;
+        log('Server push: ' + msg.type);
+        if (msg.type === 'default_display_updated') {
+            if (!splashScreen.classList.contains('hidden')) showSplash();
+        } else {
+            pollOnce();
+        }
+    };
+    socket.onclose = () => {
+        if (heartbeatTimer) { clearInterval(heartbeatTimer); heartbeatTimer = null; }
+        socket = null;
+        if (!pushEnabled) return;
+        // Reconnect with exponential backoff; poll quickly in the meantime
+        if (pollingActive) { unchangedPolls = 0; schedulePoll(); }
+        pushRetryTimer = setTimeout(openPushChannel, pushRetryDelay * (0.5 + Math.random() * 0.5));
+        pushRetryDelay = Math.min(pushRetryDelay * 2, 60000);
+    };
+}
+
+function closePushChannel() {
+    pushEnabled = false;
+    if (pushRetryTimer) { clearTimeout(pushRetryTimer); pushRetryTimer = null; }
+    if (socket) socket.close();
+}
+
+function sendHeartbeat() {
+    if (!pushConnected()) return;
+    socket.send(JSON.stringify({
+        type: 'heartbeat',
+        screen_width: window.screen.width,
+        screen_height: window.screen.height,
+    }));
 }
 
 function stopPlayback() {
     stopTransitionLoop();
-    if (playbackTimer) { clearTimeout(playbackTimer); playbackTimer = null; }
-    if (syncCheckInterval) { clearInterval(syncCheckInterval); syncCheckInterval = null; }
+    stopSyncLoop();
     stopPolling();
+    pollingPaused = false;
+    closePushChannel();
     stopTimeSyncLoop();
-    contentLayers.forEach(l => {
-        const v = l.querySelector('video');
-        if (v) v.pause();
-    });
+    layerVideos.forEach(v => { if (v) v.pause(); });
 }
 
 // ============================================================
 // SPLASH SCREEN
 // ============================================================
 
+// Create an <img> and resolve once it has decoded (or failed), so appending
+// it doesn't stall a frame decoding the image on the main thread
+function decodedImage(url) {
+    const img = document.createElement('img');
+    img.decoding = 'async';
+    img.src = url;
+    return img.decode().catch(() => {}).then(() => img);
+}
+
+let splashGeneration = 0;
+
 async function showSplash() {
-    log('Showing splash screen');
+    const generation = ++splashGeneration;
+    dlog('Showing splash screen');
     contentDisplay.classList.add('hidden');
     updateSyncIndicator('', '');
     
     try {
-        const r = await pywebview.api.get_default_display();
+        const r = bootDisplay || await pywebview.api.get_default_display();
+        bootDisplay = null;
         if (!r.success || !r.default_display) {
             splashScreen.innerHTML = '';
             splashScreen.style.background = '#000';
@@ -1340,6 +2406,7 @@ async function showSplash() {
         
         const d = r.default_display;
         const srv = r.server_url || serverUrl;
+        let bgImage = null, bgUrl = null, logoImage = null;
         
         splashScreen.innerHTML = '';
         splashScreen.className = 'position-' + (d.logo_position || 'center');
@@ -1361,13 +2428,12 @@ async function showSplash() {
             splashScreen.style.background = '#000';
         } else if (d.backgrounds?.length) {
             const bg = d.backgrounds[0];
-            const url = bg.local_path ?
+            bgUrl = bg.local_path ?
                 `${LOCAL_CACHE_URL}/splash/${bg.filename}` :
                 srv + bg.url;
-            const img = document.createElement('img');
-            img.id = 'splash-background';
-            img.src = url;
-            splashScreen.appendChild(img);
+            // Decoded off-DOM, then painted as the splash's own background
+            // rather than as an extra full-screen <img> layer
+            bgImage = decodedImage(bgUrl);
             splashScreen.style.background = '#000';
         } else {
             splashScreen.style.background = d.background_color || '#000';
@@ -1377,9 +2443,17 @@ async function showSplash() {
             const url = d.logo_local_path ?
                 `${LOCAL_CACHE_URL}/splash/${d.logo_filename}` :
                 srv + d.logo_url;
-            const logo = document.createElement('img');
+            logoImage = decodedImage(url);
+        }
+        
+        // Decode both images in parallel, then add them in one go
+        const [, logo] = await Promise.all([bgImage, logoImage]);
+        if (generation !== splashGeneration) return;  // Superseded by a newer call
+        if (bgUrl) {
+            splashScreen.style.background = `#000 url("${bgUrl}") center/cover no-repeat`;
+        }
+        if (logo) {
             logo.id = 'splash-logo';
-            logo.src = url;
             logo.style.maxWidth = (d.logo_scale * 100) + '%';
             logo.style.maxHeight = (d.logo_scale * 80) + '%';
             splashScreen.appendChild(logo);
@@ -1398,42 +2472,72 @@ async function showSplash() {
 // DEBUG & UTILITIES
 // ============================================================
 
+// Redraw the overlay at most once per frame and no more than every
+// DEBUG_REDRAW_INTERVAL ms, however many lines get logged
+const DEBUG_REDRAW_INTERVAL = 100;
+let debugPending = false;
+let debugDrawnAt = -Infinity;
+
+function scheduleDebug() {
+    if (debugPending) return;
+    debugPending = true;
+    const wait = debugDrawnAt + DEBUG_REDRAW_INTERVAL - performance.now();
+    if (wait > 0) setTimeout(() => requestAnimationFrame(drawDebug), wait);
+    else requestAnimationFrame(drawDebug);
+}
+
+function drawDebug() {
+    debugPending = false;
+    debugDrawnAt = performance.now();
+    if (debugMode) updateDebug();
+}
+
+// The overlay is built once; updates only set the text of its status and
+// log nodes, so there's no HTML to parse and no nodes to recreate
+let debugOverlay = null;
+
+function createDebugOverlay() {
+    const o = document.createElement('div');
+    o.id = 'debug-overlay';
+    o.style.cssText = 'position:fixed;inset:0;background:rgba(0,0,0,0.95);color:#0f0;font-family:monospace;font-size:11px;padding:20px;overflow:auto;z-index:9999;white-space:pre-wrap';
+    const title = document.createElement('b');
+    title.textContent = 'SYNC DEBUG (D=close R=resync S=setup)';
+    o._statusNode = document.createElement('div');
+    o._logNode = document.createElement('div');
+    o._logSeq = -1;
+    o.append(title, o._statusNode, o._logNode);
+    document.body.appendChild(o);
+    return o;
+}
+
 function updateDebug() {
-    let o = document.getElementById('debug-overlay');
-    if (!o) {
-        o = document.createElement('div');
-        o.id = 'debug-overlay';
-        o.style.cssText = 'position:fixed;inset:0;background:rgba(0,0,0,0.95);color:#0f0;font-family:monospace;font-size:11px;padding:20px;overflow:auto;z-index:9999;white-space:pre-wrap';
-        document.body.appendChild(o);
-    }
+    const o = debugOverlay || (debugOverlay = createDebugOverlay());
     
     const item = playlist[currentIndex];
-    const pos = getCurrentCyclePosition();
-    const { index, elapsed, remaining } = getItemAtPosition(pos);
     const serverNow = getServerTime();
+    const pos = getCurrentCyclePosition(serverNow);
+    const { index, elapsed, remaining } = getItemAtPosition(pos);
     
     // Calculate absolute next transition time (same calc as scheduleNextTransition)
     let nextTransitionTime = 0;
     if (item && totalCycleDuration > 0) {
         const cycleNumber = Math.floor((serverNow - syncStartTime) / totalCycleDuration);
         const cycleStartTime = syncStartTime + (cycleNumber * totalCycleDuration);
-        nextTransitionTime = cycleStartTime + item._endTime;
+        nextTransitionTime = cycleStartTime + itemEnds[currentIndex];
     }
-    const msUntilTransition = ((nextTransitionTime - serverNow) * 1000).toFixed(0);
+    const msUntilTransition = Math.round((nextTransitionTime - serverNow) * 1000);
     
     // Get video drift if applicable
     let videoDrift = 'N/A';
-    const currentLayer = contentLayers[activeLayer];
-    const video = currentLayer?.querySelector('video');
+    const video = layerVideos[activeLayer];
     if (video && item?.file_type === 'video') {
-        videoDrift = ((video.currentTime - elapsed) * 1000).toFixed(0) + 'ms';
+        videoDrift = Math.round((video.currentTime - elapsed) * 1000) + 'ms';
     }
     
-    o.innerHTML = `<b>SYNC DEBUG (D=close R=resync S=setup)</b>
-
+    o._statusNode.textContent = `
 SERVER TIME (adjusted): ${serverNow.toFixed(3)}
 Local Time (raw): ${(Date.now()/1000).toFixed(3)}
-OFFSET: ${(serverTimeOffset*1000).toFixed(0)}ms
+OFFSET: ${Math.round(serverTimeOffset*1000)}ms
 Sync Start: ${syncStartTime.toFixed(3)}
 Cycle Duration: ${totalCycleDuration.toFixed(1)}s
 Cycle Position: ${pos.toFixed(3)}s
@@ -1445,40 +2549,110 @@ Playlist: ${playlist.length} items
 Current Item: ${currentIndex} "${item?.name || 'N/A'}"
 Should Be: ${index} (${elapsed.toFixed(3)}s in, ${remaining.toFixed(3)}s left)
 Video Drift: ${videoDrift}
-Active Layer: ${activeLayer}
-
-Log:
-${debugLog.slice(-10).join('\n')}`;
+Active Layer: ${activeLayer}`;
+    
+    // The log tail only needs rebuilding when a line was added since the
+    // last redraw (a fresh overlay starts at -1)
+    if (o._logSeq !== debugLogSeq) {
+        o._logSeq = debugLogSeq;
+        o._logNode.textContent = '\nLog:\n' + tailLog(10);
+    }
 }
 
 function hideDebug() {
-    const o = document.getElementById('debug-overlay');
-    if (o) o.remove();
+    if (debugOverlay) {
+        debugOverlay.remove();
+        debugOverlay = null;
+    }
 }
 
 function showError(m) { errorMessage.textContent = m; errorMessage.classList.remove('hidden'); }
 function hideError() { errorMessage.classList.add('hidden'); }
 
-// Keyboard shortcuts
+// Keyboard shortcuts (ignored while typing into the setup form)
 document.addEventListener('keydown', e => {
-    if (e.key === 'd' || e.key === 'D') { debugMode = !debugMode; if (debugMode) updateDebug(); else hideDebug(); }
-    if (e.key === 'r' || e.key === 'R') { log('Manual resync'); resync(); }
-    if (e.key === 's' || e.key === 'S') { stopPlayback(); setupScreen.classList.remove('hidden'); contentDisplay.classList.add('hidden'); splashScreen.classList.add('hidden'); }
+    if (e.target instanceof HTMLInputElement) return;
+    switch ((e.key || '').toLowerCase()) {
+        case 'd': debugMode = !debugMode; if (debugMode) updateDebug(); else hideDebug(); break;
+        case 'r': log('Manual resync'); resync(); break;
+        case 's': stopPlayback(); setupScreen.classList.remove('hidden'); contentDisplay.classList.add('hidden'); splashScreen.classList.add('hidden'); break;
+    }
+}, { passive: true });
+
+// Keep the access code to at most 6 digits. Typing a digit into a short
+// code is already valid, so only rebuild the value when it isn't
+accessCodeInput.addEventListener('input', e => {
+    const v = e.target.value;
+    if (/^\d{0,6}$/.test(v)) return;
+    let digits = '';
+    for (let i = 0; i < v.length && digits.length < 6; i++) {
+        const c = v[i];
+        if (c >= '0' && c <= '9') digits += c;
+    }
+    e.target.value = digits;
 });
-
-accessCodeInput.addEventListener('input', e => { e.target.value = e.target.value.replace(/\D/g, '').slice(0, 6); });
 accessCodeInput.addEventListener('keydown', e => { if (e.key === 'Enter') connect(); });
 
-window.addEventListener('pywebviewready', init);
-setTimeout(() => { if (typeof pywebview !== 'undefined') init(); }, 1000);
+// Start once the bridge is up: pywebviewready normally, straight away if the
+// API was injected before this script ran, or a late fallback check
+let initStarted = false;
+function safeInit() {
+    // pywebview.api can exist before its methods are bound - wait for them
+    if (initStarted || typeof pywebview === 'undefined' || !pywebview.api ||
+        typeof pywebview.api.get_config !== 'function') return;
+    initStarted = true;
+    init();
+}
+window.addEventListener('pywebviewready', safeInit);
+safeInit();
+if (!initStarted) setTimeout(safeInit, 1000);
 </script>
 </body></html>'''
 
 
+# The page is static, so encode and compress it once for the local server
+PLAYER_HTML = get_player_html().encode()
+PLAYER_HTML_GZ = gzip.compress(PLAYER_HTML, 6)
+
+
+def write_player_html():
+    """Write the player page to CACHE_DIR, only rewriting it when it changed"""
+    html = PLAYER_HTML
+    html_path = CACHE_DIR / "player.html"
+    digest_path = CACHE_DIR / "player.html.blake2"
+    digest = _digest(html)
+    try:
+        if html_path.exists() and digest_path.read_text() == digest:
+            return html_path
+    except OSError:
+        pass
+    html_path.write_bytes(html)
+    digest_path.write_text(digest)
+    return html_path
+
+
 def main():
+    # The GUI toolkit bindings are slow to load; import them only once the
+    # local cache server is already up
+    import webview
+    
+    # Load the page from the local server (from memory, gzipped, and on the
+    # same origin as the cached media). If the server couldn't start, load
+    # it from disk rather than pushing the whole HTML string through
+    # pywebview.
+    local_server_ready.wait(timeout=2)
+    if local_server:
+        page = {"url": f"http://127.0.0.1:{LOCAL_SERVER_PORT}/player.html"}
+    else:
+        try:
+            page = {"url": write_player_html().as_uri()}
+        except OSError as e:
+            print(f"Error caching player page: {e}")
+            page = {"html": get_player_html()}
+    
     window = webview.create_window(
         title="Digital Signage Player",
-        html=get_player_html(),
+        **page,
         width=1280,
         height=720,
         fullscreen=config.fullscreen,
@@ -1493,13 +2667,16 @@ def main():
         api.register,
         api.disconnect,
         api.get_playlist,
+        api.forget_playlist_etag,
         api.get_default_display,
+        api.get_boot_state,
         api.get_content_url,
         api.get_local_file_url,
         api.get_sync_status,
         api.get_screen_info,
         api.time_sync,
         api.log,
+        api.log_batch,
     )
     
     webview.start(debug=config.debug, private_mode=False)
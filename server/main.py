@@ -46,7 +46,7 @@ def load_config():
 CONFIG = load_config()
 SERVER_PORT = CONFIG.get("server_port", 8000)
 
-from fastapi import FastAPI, HTTPException, UploadFile, File, Form, WebSocket, WebSocketDisconnect, Depends, Query
+from fastapi import FastAPI, HTTPException, UploadFile, File, Form, WebSocket, WebSocketDisconnect, Depends, Query, Request, Response
 from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import FileResponse, JSONResponse
@@ -126,17 +126,26 @@ class ConnectionManager:
         await websocket.accept()
         self.active_connections[device_key] = websocket
     
-    def disconnect(self, device_key: str):
+    def disconnect(self, device_key: str, websocket: Optional[WebSocket] = None):
+        # A reconnecting player may already have replaced its old socket
+        if websocket is not None and self.active_connections.get(device_key) is not websocket:
+            return
         if device_key in self.active_connections:
             del self.active_connections[device_key]
     
     async def send_to_device(self, device_key: str, message: dict):
-        if device_key in self.active_connections:
-            await self.active_connections[device_key].send_json(message)
+        connection = self.active_connections.get(device_key)
+        if connection is None:
+            return
+        try:
+            await connection.send_json(message)
+        except Exception:
+            # Dead socket - drop it rather than failing the caller's request
+            self.disconnect(device_key, connection)
     
     async def broadcast(self, message: dict):
-        for connection in self.active_connections.values():
-            await connection.send_json(message)
+        for device_key in list(self.active_connections):
+            await self.send_to_device(device_key, message)
 
 manager = ConnectionManager()
 
@@ -228,6 +237,14 @@ def get_file_hash(file_path: Path) -> str:
             hash_md5.update(chunk)
     return hash_md5.hexdigest()
 
+def etag_response(request: Request, payload: dict, stable: dict) -> Response:
+    """JSON response tagged with an ETag of `stable` (the payload minus
+    fields that change on every request), or 304 if the player has it already"""
+    etag = '"%s"' % hashlib.md5(json.dumps(stable, sort_keys=True, default=str).encode()).hexdigest()
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+    return JSONResponse(payload, headers={"ETag": etag})
+
 def serialize_content_item(item: ContentItem) -> dict:
     return {
         "id": item.id,
@@ -369,7 +386,7 @@ def get_schedule_group(group_id: int, db: Session = Depends(get_db)):
     return result
 
 @app.patch("/api/schedule-groups/{group_id}")
-def update_schedule_group(group_id: int, data: ScheduleGroupUpdate, db: Session = Depends(get_db)):
+async def update_schedule_group(group_id: int, data: ScheduleGroupUpdate, db: Session = Depends(get_db)):
     group = db.query(ScheduleGroup).filter(ScheduleGroup.id == group_id).first()
     if not group:
         raise HTTPException(status_code=404, detail="Schedule group not found")
@@ -379,6 +396,13 @@ def update_schedule_group(group_id: int, data: ScheduleGroupUpdate, db: Session
     
     db.commit()
     db.refresh(group)
+    
+    # Transition and active settings are part of the player playlist
+    await manager.broadcast({
+        "type": "content_updated",
+        "group_id": group_id,
+    })
+    
     return serialize_schedule_group(group)
 
 @app.delete("/api/schedule-groups/{group_id}")
@@ -878,7 +902,7 @@ def register_player(access_code: str = Form(...), db: Session = Depends(get_db))
     }
 
 @app.get("/api/player/{access_code}/config")
-def get_player_config(access_code: str, db: Session = Depends(get_db)):
+def get_player_config(access_code: str, request: Request, db: Session = Depends(get_db)):
     """Get configuration for a player device"""
     device = db.query(Device).options(
         joinedload(Device.schedule_group).joinedload(ScheduleGroup.schedules),
@@ -905,15 +929,17 @@ def get_player_config(access_code: str, db: Session = Depends(get_db)):
             if item.is_active:
                 content_items[item.id] = serialize_content_item(item)
     
-    return {
+    payload = {
         "device": serialize_device(device),
         "content_items": list(content_items.values()),
         "default_display": serialize_default_display(default_display) if default_display else None,
         "server_time": datetime.utcnow().isoformat(),
     }
+    stable = dict(payload, server_time=None, device=dict(payload["device"], last_seen=None))
+    return etag_response(request, payload, stable)
 
 @app.get("/api/player/{access_code}/playlist")
-def get_player_playlist(access_code: str, db: Session = Depends(get_db)):
+def get_player_playlist(access_code: str, request: Request, db: Session = Depends(get_db)):
     """Get current playlist for a player device with sync timing info for synchronized playback"""
     device = db.query(Device).options(
         joinedload(Device.schedule_group).joinedload(ScheduleGroup.schedules),
@@ -984,8 +1010,11 @@ def get_player_playlist(access_code: str, db: Session = Depends(get_db)):
         else:
             total_cycle_duration += item.get("display_duration", 10)
     
-    return {
+    payload = {
         "playlist": playlist,
+        # Changes whenever items are added, removed or reordered, so players
+        # can compare one string instead of the whole list
+        "playlist_version": hashlib.sha1(",".join(str(item["id"]) for item in playlist).encode()).hexdigest(),
         "active_schedule": serialize_schedule(active_schedule) if active_schedule else None,
         "transition": {
             "type": transition_type,
@@ -1006,6 +1035,8 @@ def get_player_playlist(access_code: str, db: Session = Depends(get_db)):
         },
         "server_time": datetime.utcnow().isoformat(),
     }
+    stable = dict(payload, server_time=None, sync=dict(payload["sync"], server_time=None))
+    return etag_response(request, payload, stable)
 
 # ============== WebSocket ==============
 
@@ -1040,7 +1071,7 @@ async def websocket_endpoint(websocket: WebSocket, access_code: str, db: Session
                 pass
             
     except WebSocketDisconnect:
-        manager.disconnect(access_code)
+        manager.disconnect(access_code, websocket)
         device.is_online = False
         db.commit()
 